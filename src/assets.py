@@ -0,0 +1,97 @@
+# assets.py
+import logging
+import os
+import time
+import pygame
+
+DEFAULT_ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+logger = logging.getLogger("8bit.assets")
+
+
+def init_display():
+    """
+    Initializes only the pygame modules needed to open a window, draw and read input.
+
+    pygame.init() also starts audio, joysticks and every other subsystem, which can take hundreds of
+    milliseconds on real hardware; fonts and the mixer are started by Assets when first needed instead.
+    """
+    pygame.display.init()
+
+
+class Assets:
+    def __init__(self, directory=DEFAULT_ASSET_DIR):
+        """
+        Initializes a loader that reads fonts, images and sounds on first use and keeps them for later.
+
+        Args:
+            directory (str): Directory image and sound names are relative to.
+        """
+        self.directory = directory
+        self.load_seconds = 0.0  # Total time spent loading, e.g. for startup reports
+        self.__fonts = {}  # (name, size) -> pygame.font.Font
+        self.__images = {}  # Name -> converted Surface
+        self.__sounds = {}  # Name -> pygame.mixer.Sound, or None if audio is unavailable
+
+    def font(self, size, name=None):
+        """
+        Returns a font, starting the font module the first time one is needed.
+
+        Args:
+            size (int): Font size in pixels.
+            name (str): Path of a font file, pygame's default font if omitted.
+
+        Returns:
+            pygame.font.Font: The font.
+        """
+        font = self.__fonts.get((name, size))
+        if font is None:
+            start = time.perf_counter()
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.__fonts[(name, size)] = pygame.font.Font(name, size)
+            self.load_seconds += time.perf_counter() - start
+        return font
+
+    def image(self, name):
+        """
+        Returns an image converted to the display's pixel format, so blitting it needs no conversion.
+
+        Args:
+            name (str): File name relative to the asset directory.
+
+        Returns:
+            pygame.Surface: The image.
+        """
+        image = self.__images.get(name)
+        if image is None:
+            start = time.perf_counter()
+            image = pygame.image.load(os.path.join(self.directory, name))
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self.__images[name] = image
+            self.load_seconds += time.perf_counter() - start
+        return image
+
+    def sound(self, name):
+        """
+        Returns a sound, starting the mixer the first time one is needed.
+
+        Args:
+            name (str): File name relative to the asset directory.
+
+        Returns:
+            pygame.mixer.Sound: The sound, or None if no audio device is available.
+        """
+        if name not in self.__sounds:
+            start = time.perf_counter()
+            sound = None
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                sound = pygame.mixer.Sound(os.path.join(self.directory, name))
+            except pygame.error as error:
+                logger.warning("sound %s unavailable: %s", name, error)
+            self.__sounds[name] = sound
+            self.load_seconds += time.perf_counter() - start
+        return self.__sounds[name]
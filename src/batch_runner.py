@@ -0,0 +1,186 @@
+# batch_runner.py
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from simulation import Simulation, INPUT_LEFT, INPUT_RIGHT, INPUT_SHOOT
+from waves import load_wave_table, scale_wave_table
+
+_wave_table = None  # Loaded once per worker process
+
+
+def idle_policy(simulation, rng):
+    """Never moves or shoots."""
+    return 0
+
+
+def random_policy(simulation, rng):
+    """Presses a random combination of left, right and shoot every tick."""
+    return rng.randrange(8)
+
+
+def tracker_policy(simulation, rng):
+    """Moves under the nearest enemy and keeps shooting."""
+    spaceship = simulation.player_spaceship
+    center = spaceship.x + spaceship.width / 2
+    inputs = INPUT_SHOOT
+    if simulation.enemies:
+        target = min(simulation.enemies, key=lambda enemy: abs(enemy.x + enemy.width / 2 - center))
+        target_center = target.x + target.width / 2
+        if target_center < center - 5:
+            inputs |= INPUT_LEFT
+        elif target_center > center + 5:
+            inputs |= INPUT_RIGHT
+    return inputs
+
+
+def lead_policy(simulation, rng):
+    """Moves under the spot where the nearest enemy will be when a shot fired now reaches it, and keeps shooting."""
+    spaceship = simulation.player_spaceship
+    center = spaceship.x + spaceship.width / 2
+    inputs = INPUT_SHOOT
+    if simulation.enemies:
+        # Player shots climb 10 pixels per tick, so they reach the lowest enemies after this many ticks
+        lowest = max(enemy.y + enemy.height for enemy in simulation.enemies)
+        predictions = simulation.predict_enemies(max(0, int((spaceship.y - lowest) // 10)))
+        if predictions:
+            target, x, _, _ = min(predictions, key=lambda entry: abs(entry[1] + entry[0].width / 2 - center))
+            target_center = x + target.width / 2
+            if target_center < center - 5:
+                inputs |= INPUT_LEFT
+            elif target_center > center + 5:
+                inputs |= INPUT_RIGHT
+    return inputs
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "tracker": tracker_policy,
+    "lead": lead_policy,
+}
+
+
+def _init_worker():
+    """
+    Prepares a worker process; the simulation never opens a window, but pygame must not try to either.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def run_episode(seed, policy="tracker", max_ticks=60 * 60 * 5, speed_scale=1.0, shoot_rate_scale=1.0,
+                width=800, height=600):
+    """
+    Plays one headless game until game over or max_ticks.
+
+    Args:
+        seed (int): Seed for the simulation and the policy.
+        policy (str or callable): Name from POLICIES, or a picklable function (simulation, rng) -> inputs.
+        max_ticks (int): Tick limit for the episode.
+        speed_scale (float): Factor applied to every enemy's speed.
+        shoot_rate_scale (float): Factor applied to every enemy's shoot rate.
+        width (int): Width of the playing field.
+        height (int): Height of the playing field.
+
+    Returns:
+        dict: Seed, score, survival time and lives lost for the episode.
+    """
+    global _wave_table
+    if _wave_table is None:
+        _wave_table = load_wave_table()
+    table = _wave_table
+    if speed_scale != 1.0 or shoot_rate_scale != 1.0:
+        table = scale_wave_table(table, speed_scale, shoot_rate_scale)
+
+    choose_inputs = POLICIES[policy] if isinstance(policy, str) else policy
+    policy_rng = random.Random(seed ^ 0x5EED)
+    simulation = Simulation(width, height, seed=seed, wave_table=table)
+    starting_lives = simulation.player_spaceship.lives
+
+    while simulation.tick < max_ticks and not simulation.is_game_over:
+        simulation.step(choose_inputs(simulation, policy_rng))
+
+    return {
+        "seed": seed,
+        "score": simulation.score,
+        "survival_ticks": simulation.tick,
+        "survival_seconds": simulation.time_ms / 1000,
+        "lives_lost": starting_lives - simulation.player_spaceship.lives,
+        "game_over": simulation.is_game_over,
+    }
+
+
+def _run_episode_kwargs(kwargs):
+    return run_episode(**kwargs)
+
+
+def run_batch(episodes, workers=None, chunksize=None):
+    """
+    Runs independent episodes across a pool of worker processes.
+
+    Args:
+        episodes (list): Keyword-argument dicts for run_episode, each with at least a seed.
+        workers (int): Number of worker processes, defaults to the CPU count.
+        chunksize (int): Episodes handed to a worker at a time, chosen automatically if omitted.
+
+    Returns:
+        list: run_episode results in the same order as episodes.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_episode(**episode) for episode in episodes]
+    if chunksize is None:
+        chunksize = max(1, len(episodes) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(_run_episode_kwargs, episodes, chunksize=chunksize))
+
+
+def summarize(results):
+    """
+    Aggregates episode results.
+
+    Args:
+        results (list): run_episode results.
+
+    Returns:
+        dict: Episode count and mean score, survival time and lives lost.
+    """
+    count = len(results)
+    return {
+        "episodes": count,
+        "mean_score": sum(result["score"] for result in results) / count,
+        "mean_survival_seconds": sum(result["survival_seconds"] for result in results) / count,
+        "mean_lives_lost": sum(result["lives_lost"] for result in results) / count,
+        "game_over_rate": sum(result["game_over"] for result in results) / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless episodes in parallel")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="tracker")
+    parser.add_argument("--max-ticks", type=int, default=60 * 60 * 5, help="tick limit per episode")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--speed-scale", type=float, default=1.0, help="factor applied to enemy speeds")
+    parser.add_argument("--shoot-rate-scale", type=float, default=1.0, help="factor applied to enemy shoot rates")
+    args = parser.parse_args()
+
+    episodes = [{"seed": args.seed + i, "policy": args.policy, "max_ticks": args.max_ticks,
+                 "speed_scale": args.speed_scale, "shoot_rate_scale": args.shoot_rate_scale}
+                for i in range(args.episodes)]
+    start = time.perf_counter()
+    results = run_batch(episodes, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    total_ticks = sum(result["survival_ticks"] for result in results)
+    print(f"{summary['episodes']} episodes in {elapsed:.2f}s ({summary['episodes'] / elapsed:.1f} episodes/s, "
+          f"{total_ticks / elapsed:.0f} ticks/s)")
+    print(f"mean score {summary['mean_score']:.1f}, mean survival {summary['mean_survival_seconds']:.1f}s, "
+          f"mean lives lost {summary['mean_lives_lost']:.2f}, game over rate {summary['game_over_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
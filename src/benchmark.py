@@ -0,0 +1,328 @@
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run without a window, e.g. on CI
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from enemy import Enemy  # noqa: E402  (the SDL driver must be chosen before pygame is imported)
+from game_manager import GameManager  # noqa: E402
+from simulation import Simulation  # noqa: E402
+
+DEFAULT_SCENES = [(1, 10), (10, 100), (100, 1000), (1000, 1000), (100, 10000), (1000, 10000)]
+PHASES = ["update_game_state", "check_enemy_collisions", "check_player_collision", "draw_objects"]
+
+
+def _spawn_enemy(simulation, rng, x, y):
+    """
+    Adds an enemy with a random speed and shoot rate to the scene.
+
+    Args:
+        simulation (Simulation): The simulation to populate.
+        rng (random.Random): Random generator for the enemy's parameters.
+        x (float): Initial x-coordinate.
+        y (float): Initial y-coordinate.
+    """
+    eid = simulation.waves.next_eid
+    simulation.waves.next_eid += 1
+    simulation.add_enemies([Enemy(eid=eid, x=x, y=y, speed=rng.choice([-2, -4, -6]),
+                                  shoot_rate=rng.randint(500, 2000))])
+
+
+def _spawn_projectiles(simulation, player_count, enemy_count, rng):
+    """
+    Adds projectiles at random positions: player projectiles below the enemies, enemy projectiles anywhere.
+
+    Args:
+        simulation (Simulation): The simulation to populate.
+        player_count (int): Number of player projectiles to add.
+        enemy_count (int): Number of enemy projectiles to add.
+        rng (random.Random): Random generator for the positions.
+    """
+    pool = simulation.projectile_pool
+    # With an entity store the lists are copies and acquiring a projectile is what adds it. A projectile over
+    # the pool's live cap is skipped like in Simulation.shoot_projectile; the measured counts show the shortfall.
+    player_projectiles = simulation.player_projectiles
+    for _ in range(player_count):
+        projectile = pool.acquire(x=rng.uniform(0, 790), y=rng.uniform(300, 600), width=10, height=50, speed=10,
+                                  length=50, direction="up")
+        if projectile is not None:
+            player_projectiles.append(projectile)
+    enemy_projectiles = simulation.enemy_projectiles
+    for _ in range(enemy_count):
+        projectile = pool.acquire(x=rng.uniform(0, 790), y=rng.uniform(0, 600), width=10, height=20, speed=8,
+                                  length=20, direction="down")
+        if projectile is not None:
+            enemy_projectiles.append(projectile)
+
+
+def build_scene(game_manager, enemy_count, projectile_count, seed=0):
+    """
+    Replaces the game state with a synthetic scene.
+
+    Enemies fill the upper half of the screen in a grid, player projectiles are scattered below them
+    and enemy projectiles are scattered over the whole screen.
+
+    Args:
+        game_manager (GameManager): The game to populate.
+        enemy_count (int): Number of enemies.
+        projectile_count (int): Number of projectiles, split evenly between player and enemy.
+        seed (int): Seed for the projectile positions.
+
+    Returns:
+        random.Random: The generator the scene was built with, to keep refilling it.
+    """
+    rng = random.Random(seed)
+    simulation = game_manager.simulation
+    game_manager.reset_game()
+    simulation.player_spaceship.lives = 5
+    pool = simulation.projectile_pool
+    pool.max_live = max(pool.max_live, projectile_count + 1024)
+
+    columns = max(1, int(enemy_count ** 0.5 * 1.5))
+    simulation.enemies = []
+    for i in range(enemy_count):
+        row, column = divmod(i, columns)
+        _spawn_enemy(simulation, rng, (column * 750 / columns) % 750,
+                     (row * 300 / max(1, enemy_count // columns)) % 300)
+    _spawn_projectiles(simulation, projectile_count // 2, projectile_count - projectile_count // 2, rng)
+    return rng
+
+
+def refill_scene(game_manager, enemy_count, projectile_count, rng):
+    """
+    Brings a scene back to its size after a tick destroyed enemies, spent or culled projectiles and fired new ones.
+
+    Replacement enemies go to random spots in the upper half of the screen and replacement projectiles to
+    random spots as in build_scene. Projectiles beyond the scene size, i.e. the latest enemy shots, are returned
+    to the pool, so measured ticks always see the stated number of entities.
+
+    Args:
+        game_manager (GameManager): The game to refill.
+        enemy_count (int): Number of enemies the scene should hold.
+        projectile_count (int): Number of projectiles the scene should hold.
+        rng (random.Random): Random generator for the replacements, as returned by build_scene.
+    """
+    simulation = game_manager.simulation
+    simulation.player_spaceship.lives = 5  # Keep the player in the game
+    for _ in range(enemy_count - len(simulation.enemies)):
+        _spawn_enemy(simulation, rng, rng.uniform(0, 750), rng.uniform(0, 300))
+    player_count = projectile_count // 2
+    enemy_projectile_count = projectile_count - player_count
+    for projectiles, count in ((simulation.player_projectiles, player_count),
+                               (simulation.enemy_projectiles, enemy_projectile_count)):
+        for projectile in projectiles[count:]:
+            simulation.projectile_pool.release(projectile)
+        del projectiles[count:]
+    _spawn_projectiles(simulation, player_count - len(simulation.player_projectiles),
+                       enemy_projectile_count - len(simulation.enemy_projectiles), rng)
+
+
+def summarize(samples):
+    """
+    Summarizes latency samples.
+
+    Args:
+        samples (list): Latencies in seconds.
+
+    Returns:
+        dict: Mean, median, p95 and max in milliseconds.
+    """
+    ordered = sorted(samples)
+    return {
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def run_scene(game_manager, enemy_count, projectile_count, rounds, ticks):
+    """
+    Benchmarks the simulation and rendering hot paths on one synthetic scene.
+
+    The scene is refilled before every measured update tick, so the timings describe a scene of the stated
+    size rather than one being emptied by its own collisions and culling.
+
+    Args:
+        game_manager (GameManager): The game to drive.
+        enemy_count (int): Number of enemies in the scene.
+        projectile_count (int): Number of projectiles in the scene.
+        rounds (int): Number of times the scene is rebuilt and measured.
+        ticks (int): Number of consecutive update ticks measured per round.
+
+    Returns:
+        dict: Ticks per second, per-phase latency, memory growth and the mean entity counts the update ticks
+        were measured with.
+    """
+    simulation = game_manager.simulation
+    samples = {phase: [] for phase in PHASES}
+    measured_counts = {"enemies": 0, "player_projectiles": 0, "enemy_projectiles": 0}
+    for round_index in range(rounds):
+        for phase in PHASES:
+            rng = build_scene(game_manager, enemy_count, projectile_count, seed=round_index)
+            method = getattr(game_manager, phase)
+            repeats = ticks if phase == "update_game_state" else 1
+            for _ in range(repeats):
+                if phase == "update_game_state":
+                    refill_scene(game_manager, enemy_count, projectile_count, rng)
+                    for kind, count in simulation.get_entity_counts().items():
+                        measured_counts[kind] += count
+                start = time.perf_counter()
+                method()
+                samples[phase].append(time.perf_counter() - start)
+
+    update_samples = samples["update_game_state"]
+    update_total = sum(update_samples)
+    result = {
+        "enemies": enemy_count,
+        "projectiles": projectile_count,
+        "measured": {kind: count / len(update_samples) for kind, count in measured_counts.items()},
+        "ticks_per_sec": len(update_samples) / update_total if update_total else 0.0,
+        "phases": {phase: summarize(phase_samples) for phase, phase_samples in samples.items()},
+    }
+
+    # Memory is measured in a separate pass because tracemalloc slows everything down. The scene is built
+    # while tracing, so that freeing replaced entities counts, and the baseline is taken after the first tick,
+    # which solves the path of every enemy.
+    tracemalloc.start()
+    rng = build_scene(game_manager, enemy_count, projectile_count)
+    game_manager.update_game_state()
+    refill_scene(game_manager, enemy_count, projectile_count, rng)
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(ticks):
+        game_manager.update_game_state()
+        refill_scene(game_manager, enemy_count, projectile_count, rng)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["memory_growth_kb"] = (current - baseline) / 1024
+    result["memory_peak_kb"] = (peak - baseline) / 1024
+    return result
+
+
+def run_benchmarks(scenes, rounds, ticks, entity_store=False):
+    """
+    Runs every scene and collects the results.
+
+    Args:
+        scenes (list): (enemy count, projectile count) pairs.
+        rounds (int): Number of rounds per scene.
+        ticks (int): Number of update ticks per round.
+        entity_store (bool): Benchmark the array-backed simulation, see Simulation.
+
+    Returns:
+        dict: Environment information and one result per scene.
+    """
+    game_manager = GameManager(800, 600, simulation=Simulation(800, 600, entity_store=entity_store))
+    results = []
+    for enemy_count, projectile_count in scenes:
+        result = run_scene(game_manager, enemy_count, projectile_count, rounds, ticks)
+        results.append(result)
+        print(format_result(result))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": rounds,
+        "ticks": ticks,
+        "entity_store": entity_store,
+        "scenes": results,
+    }
+
+
+def format_result(result):
+    """
+    Formats one scene result as a single line.
+
+    Args:
+        result (dict): A scene result from run_scene.
+
+    Returns:
+        str: Human-readable summary.
+    """
+    phases = "  ".join(f"{phase} {stats['mean_ms']:.3f}ms" for phase, stats in result["phases"].items())
+    measured = result["measured"]
+    return (f"{result['enemies']:>5} enemies {result['projectiles']:>6} projectiles "
+            f"(measured {measured['enemies']:.0f}/"
+            f"{measured['player_projectiles'] + measured['enemy_projectiles']:.0f}): "
+            f"{result['ticks_per_sec']:>9.0f} ticks/s  {phases}  mem +{result['memory_growth_kb']:.0f}KB")
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the change of every metric against a saved baseline.
+
+    Args:
+        results (dict): Results of the current run.
+        baseline (dict): Results loaded from a baseline file.
+        threshold (float): Relative slowdown, e.g. 0.1 for 10%, above which a metric counts as a regression.
+
+    Returns:
+        int: Number of regressions found.
+    """
+    baseline_scenes = {(scene["enemies"], scene["projectiles"]): scene for scene in baseline["scenes"]}
+    regressions = 0
+    for scene in results["scenes"]:
+        old = baseline_scenes.get((scene["enemies"], scene["projectiles"]))
+        if old is None:
+            continue
+        label = f"{scene['enemies']} enemies / {scene['projectiles']} projectiles"
+        change = scene["ticks_per_sec"] / old["ticks_per_sec"] - 1 if old["ticks_per_sec"] else 0.0
+        print(f"{label}: ticks/s {old['ticks_per_sec']:.0f} -> {scene['ticks_per_sec']:.0f} ({change:+.1%})")
+        if change < -threshold:
+            regressions += 1
+        for phase, stats in scene["phases"].items():
+            old_mean = old["phases"].get(phase, {}).get("mean_ms")
+            if not old_mean:
+                continue
+            change = stats["mean_ms"] / old_mean - 1
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"    {phase}: {old_mean:.3f}ms -> {stats['mean_ms']:.3f}ms ({change:+.1%}){flag}")
+            if change > threshold:
+                regressions += 1
+    return regressions
+
+
+def parse_scenes(text):
+    """
+    Parses a scene list such as "1:10,100:1000".
+
+    Args:
+        text (str): Comma-separated enemies:projectiles pairs.
+
+    Returns:
+        list: (enemy count, projectile count) pairs.
+    """
+    return [tuple(int(part) for part in scene.split(":")) for scene in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's simulation and rendering hot paths")
+    parser.add_argument("--scenes", type=parse_scenes, default=DEFAULT_SCENES,
+                        help="comma-separated enemies:projectiles pairs, e.g. 1:10,1000:10000")
+    parser.add_argument("--rounds", type=int, default=5, help="times each scene is rebuilt and measured")
+    parser.add_argument("--ticks", type=int, default=60, help="update ticks measured per round")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument("--entity-store", action="store_true", help="benchmark the array-backed simulation")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scenes, args.rounds, args.ticks, args.entity_store)
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=1)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# bullet_hell.py
+import argparse
+import json
+import math
+import os
+import platform
+import time
+import numpy as np
+import pygame
+from entity_store import EntityStore
+from spaceship import Spaceship
+from sprites import SpriteCache
+from text_cache import TextCache
+from assets import Assets, init_display
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_SHOOT
+
+DEFAULT_BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bullet_hell_budget.json")
+
+# Emission patterns by name. Radial and spiral emitters fire evenly spaced bullets around the enemy and turn by
+# spin radians after every volley; aimed emitters fire a fan of the given spread at the player.
+DEFAULT_PATTERNS = {
+    "radial": {"type": "radial", "bullets": 24, "period_ms": 900, "speed": 2.5, "spin": math.pi / 24},
+    "aimed": {"type": "aimed", "bullets": 5, "period_ms": 600, "speed": 4.0, "spread": 0.6},
+    "spiral": {"type": "spiral", "bullets": 3, "period_ms": 100, "speed": 3.0, "spin": 0.35},
+}
+
+BULLET_COLOR = (255, 0, 0)
+ENEMY_SIZE = 30
+
+
+def _dilate(mask, size, axis):
+    """
+    Grows every set cell of a boolean mask into a run of size cells along one axis, in place.
+
+    Args:
+        mask (numpy.ndarray): 2D boolean mask.
+        size (int): Length of the runs.
+        axis (int): 0 to grow along the first axis, 1 along the second.
+    """
+    covered = 1
+    while covered < size:
+        step = min(covered, size - covered)
+        if axis == 0:
+            mask[step:] |= mask[:-step].copy()
+        else:
+            mask[:, step:] |= mask[:, :-step].copy()
+        covered += step
+
+
+class BulletHell:
+    def __init__(self, width=800, height=600, enemies=500, patterns=None, mix=("radial", "aimed", "spiral"), seed=0,
+                 tick_rate=60, bullet_size=6):
+        """
+        Initializes a stress mode with hundreds of enemies filling the screen with bullet patterns.
+
+        Entities live in EntityStores and every phase of a tick, from emission to collisions, is a handful
+        of NumPy operations, so the cost per tick barely depends on the number of bullets.
+
+        Args:
+            width (int): Width of the playing field.
+            height (int): Height of the playing field.
+            enemies (int): Number of enemies; a destroyed enemy is replaced at once, keeping the load constant.
+            patterns (dict): Pattern name -> parameters, merged over DEFAULT_PATTERNS.
+            mix (tuple): Pattern names handed out to the enemies in turn.
+            seed (int): Seed for enemy placement and the autopilot.
+            tick_rate (int): Simulation ticks per simulated second.
+            bullet_size (int): Width and height of enemy bullets in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        self.bullet_size = bullet_size
+        self.patterns = {name: dict(params) for name, params in DEFAULT_PATTERNS.items()}
+        for name, params in (patterns or {}).items():
+            self.patterns.setdefault(name, {}).update(params)
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+        self.time_ms = 0
+        self.score = 0
+        self.hits = 0  # Times the player was hit; the mode has no game over
+        self.peak_bullets = 0
+        self.player = Spaceship(name="Player", x=width // 2, y=height - 60, width=50, height=50)
+        self.last_shot_time = -math.inf
+        self.last_hit_time = -math.inf
+
+        # Enemies never leave their slots, so per-enemy pattern state is kept in arrays indexed by slot
+        self.mix = [self.patterns[name] for name in mix]
+        self.enemy_pattern = np.arange(enemies) % len(self.mix)
+        self.enemy_phase = self.rng.uniform(0, 2 * math.pi, enemies)
+        periods = np.array([pattern["period_ms"] for pattern in self.mix], dtype=float)[self.enemy_pattern]
+        self.enemies = EntityStore(enemies)
+        self.enemies.spawn_many(self.rng.uniform(0, width - ENEMY_SIZE, enemies),
+                                self.rng.uniform(20, height / 2 - ENEMY_SIZE, enemies), ENEMY_SIZE, ENEMY_SIZE,
+                                vx=self.rng.choice([-1, 1], enemies) * self.rng.uniform(1, 3, enemies),
+                                period=periods, timer=-self.rng.uniform(0, periods))  # Stagger the first volleys
+        self.bullets = EntityStore(65536)
+        self.player_bullets = EntityStore(64)
+
+        self.sprites = SpriteCache()
+        self.text_cache = TextCache(max_entries=64)
+        self.assets = Assets()
+        self.__mask = np.zeros((width, height), dtype=bool)  # Bullet coverage, indexed like surfarray pixels
+
+    def step(self, inputs=0):
+        """
+        Advances the mode by one tick.
+
+        Args:
+            inputs (int): Bitwise OR of the INPUT_* flags held during this tick.
+        """
+        self.tick += 1
+        self.time_ms = self.tick * self.tick_ms
+        player = self.player
+        if inputs & INPUT_LEFT:
+            player.move(-5, 0, self.width)
+        if inputs & INPUT_RIGHT:
+            player.move(5, 0, self.width)
+        if inputs & INPUT_SHOOT and self.time_ms - self.last_shot_time > 200:
+            self.player_bullets.spawn(player.x + player.width // 2 - 5, player.y, 10, 20, vy=-10)
+            self.last_shot_time = self.time_ms
+
+        self.enemies.bounce(self.width)
+        self.__emit()
+        self.bullets.move()
+        self.player_bullets.move()
+        self.__collide()
+        self.bullets.cull(self.width, self.height)
+        self.player_bullets.cull(self.width, self.height)
+        player.update_blinking(self.time_ms)
+        self.peak_bullets = max(self.peak_bullets, len(self.bullets))
+
+    def __emit(self):
+        """
+        Fires the volleys of every enemy whose pattern is due this tick.
+        """
+        enemies = self.enemies
+        due = enemies.due(self.time_ms)
+        if len(due) == 0:
+            return
+        size = self.bullet_size
+        player = self.player
+        origin_x = enemies.x[due] + (ENEMY_SIZE - size) / 2
+        origin_y = enemies.y[due] + ENEMY_SIZE
+        due_patterns = self.enemy_pattern[due]
+        for pattern_index, pattern in enumerate(self.mix):
+            selected = np.flatnonzero(due_patterns == pattern_index)
+            if len(selected) == 0:
+                continue
+            count = pattern["bullets"]
+            x = origin_x[selected]
+            y = origin_y[selected]
+            if pattern["type"] == "aimed":
+                base = np.arctan2(player.y + player.height / 2 - y, player.x + player.width / 2 - x)
+                offsets = np.linspace(-pattern["spread"] / 2, pattern["spread"] / 2, count) if count > 1 else [0.0]
+            else:
+                slots = due[selected]
+                base = self.enemy_phase[slots]
+                self.enemy_phase[slots] += pattern["spin"]
+                offsets = np.arange(count) * (2 * math.pi / count)
+            angles = (base[:, None] + np.asarray(offsets)[None, :]).ravel()
+            speed = pattern["speed"]
+            self.bullets.spawn_many(np.repeat(x, count), np.repeat(y, count), size, size,
+                                    vx=np.cos(angles) * speed, vy=np.sin(angles) * speed)
+
+    def __collide(self):
+        """
+        Checks enemy bullets against the player and player bullets against the enemies.
+        """
+        player = self.player
+        bullets = self.bullets
+        n = bullets.count
+        x = bullets.x[:n]
+        y = bullets.y[:n]
+        touching = np.flatnonzero(bullets.alive[:n] & (y + self.bullet_size > player.y) &
+                                  (y < player.y + player.height) & (x + self.bullet_size > player.x) &
+                                  (x < player.x + player.width))
+        if len(touching):
+            bullets.kill_many(touching)
+            if self.time_ms - self.last_hit_time >= 1000:  # Same grace period as the regular game
+                self.hits += 1
+                self.last_hit_time = self.time_ms
+                player.start_blinking(self.time_ms)
+
+        shots = self.player_bullets.active_indices()
+        if len(shots):
+            shot_indices, enemy_indices = self.enemies.hits(self.player_bullets.x[shots] + 5,
+                                                            self.player_bullets.y[shots])
+            if len(shot_indices):
+                self.player_bullets.kill_many(shots[shot_indices])
+                destroyed = np.unique(enemy_indices)
+                self.score += 10 * len(destroyed)
+                # Replacements appear at the top, keeping their slot, pattern and speed
+                self.enemies.x[destroyed] = self.rng.uniform(0, self.width - ENEMY_SIZE, len(destroyed))
+                self.enemies.y[destroyed] = self.rng.uniform(20, self.height / 4, len(destroyed))
+
+    def draw(self, screen):
+        """
+        Draws the whole scene.
+
+        Enemy bullets are not blitted one by one: their positions are stamped into a boolean coverage mask,
+        grown to the bullet size with a few shifted ORs and written to the screen in one masked assignment.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+        """
+        screen.fill((255, 255, 255))
+        enemies = self.enemies
+        indices = enemies.active_indices()
+        surface = self.sprites.get(ENEMY_SIZE, ENEMY_SIZE, (128, 0, 128))
+        screen.blits([(surface, position) for position in
+                      np.column_stack((enemies.x[indices], enemies.y[indices])).tolist()], doreturn=False)
+        shots = self.player_bullets.active_indices()
+        if len(shots):
+            surface = self.sprites.get(10, 20, (0, 255, 0))
+            screen.blits([(surface, position) for position in np.column_stack(
+                (self.player_bullets.x[shots], self.player_bullets.y[shots])).tolist()], doreturn=False)
+        player = self.player
+        color = player.get_color(self.time_ms)
+        if color is not None:
+            screen.blit(self.sprites.get(player.width, player.height, color), (player.x, player.y))
+
+        bullets = self.bullets
+        indices = bullets.active_indices()
+        mask = self.__mask
+        mask[:] = False
+        # Bullets partly off the top or left edge are stamped at the edge
+        mask[np.clip(bullets.x[indices], 0, self.width - 1).astype(np.intp),
+             np.clip(bullets.y[indices], 0, self.height - 1).astype(np.intp)] = True
+        _dilate(mask, self.bullet_size, 0)
+        _dilate(mask, self.bullet_size, 1)
+        pixels = pygame.surfarray.pixels2d(screen)
+        pixels[mask] = screen.map_rgb(BULLET_COLOR)
+        del pixels  # Unlocks the screen
+
+        font = self.assets.font(24)
+        hud = f"Score: {self.score}  Hits: {self.hits}  Bullets: {len(indices)}"
+        screen.blit(self.text_cache.render(font, hud, (0, 0, 0)), (10, 10))
+
+
+def autopilot(rng, tick):
+    """
+    Returns inputs for an unattended run: the player drifts left and right and keeps shooting.
+
+    Args:
+        rng (numpy.random.Generator): Random generator of the run.
+        tick (int): Current tick.
+
+    Returns:
+        int: INPUT_* flags.
+    """
+    direction = INPUT_LEFT if (tick // 90) % 2 else INPUT_RIGHT
+    return (direction | INPUT_SHOOT) if rng.random() < 0.9 else INPUT_SHOOT
+
+
+def measure(frames=600, enemies=500, seed=1, width=800, height=600, warmup=120):
+    """
+    Runs the mode headless and times every frame, simulation and drawing included.
+
+    Args:
+        frames (int): Number of frames timed.
+        enemies (int): Number of enemies.
+        seed (int): Seed of the run.
+        width (int): Width of the playing field.
+        height (int): Height of the playing field.
+        warmup (int): Frames run first, untimed, so the screen has filled with bullets.
+
+    Returns:
+        dict: Frame time mean, p95 and max in milliseconds, plus the peak and final bullet counts.
+    """
+    init_display()
+    screen = pygame.display.set_mode((width, height))
+    game = BulletHell(width, height, enemies=enemies, seed=seed)
+    rng = np.random.default_rng(seed)
+    samples = []
+    for frame in range(warmup + frames):
+        start = time.perf_counter()
+        game.step(autopilot(rng, game.tick))
+        game.draw(screen)
+        pygame.display.flip()
+        if frame >= warmup:
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "max_ms": samples[-1] * 1000,
+        "peak_bullets": game.peak_bullets,
+        "bullets": len(game.bullets),
+    }
+
+
+def check_budget(budget, result):
+    """
+    Compares a measurement against a recorded frame-time budget.
+
+    Args:
+        budget (dict): Budget as written by --record.
+        result (dict): Measurement from measure.
+
+    Returns:
+        list: Descriptions of every limit that was exceeded, empty if the run is within budget.
+    """
+    failures = []
+    for key in ("mean_ms", "p95_ms"):
+        if result[key] > budget["limits"][key]:
+            failures.append(f"{key} {result[key]:.2f} > {budget['limits'][key]:.2f}")
+    if result["peak_bullets"] < budget["min_peak_bullets"]:
+        failures.append(f"only {result['peak_bullets']} bullets, the scene needs {budget['min_peak_bullets']}")
+    return failures
+
+
+def run_windowed(enemies=500, seed=None, autoplay=False):
+    """
+    Plays the mode in a window with the keyboard, or watches the autopilot play it.
+
+    Args:
+        enemies (int): Number of enemies.
+        seed (int): Seed for enemy placement.
+        autoplay (bool): Let the autopilot steer instead of the keyboard.
+    """
+    from controls import Controls
+
+    init_display()
+    screen = pygame.display.set_mode((800, 600))
+    game = BulletHell(800, 600, enemies=enemies, seed=seed)
+    controls = Controls()
+    controls.enable_gamepads()
+    clock = pygame.time.Clock()
+    rng = np.random.default_rng(seed)
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            controls.push(event)
+        game.step(autopilot(rng, game.tick) if autoplay else controls.take())
+        game.draw(screen)
+        pygame.display.flip()
+        clock.tick(game.tick_rate)
+        pygame.display.set_caption(f"8bit Game - bullet hell - {clock.get_fps():.0f} FPS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bullet-hell stress mode and frame-time acceptance test")
+    parser.add_argument("--enemies", type=int, default=500, help="number of enemies")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the run")
+    parser.add_argument("--autoplay", action="store_true", help="let the autopilot play in the window")
+    parser.add_argument("--check", action="store_true",
+                        help="run headless and fail if the frame times exceed the recorded budget")
+    parser.add_argument("--record", action="store_true", help="run headless and record the budget from this run")
+    parser.add_argument("--frames", type=int, default=600, help="frames timed by --record")
+    parser.add_argument("--headroom", type=float, default=1.5,
+                        help="factor between the measured frame times and the limits written by --record")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_PATH, help="budget file used by --check and --record")
+    args = parser.parse_args()
+
+    if not (args.check or args.record):
+        run_windowed(args.enemies, args.seed, args.autoplay)
+        return
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Frame times are measured without a window, e.g. on CI
+    if args.record:
+        result = measure(args.frames, args.enemies, args.seed)
+        budget = {
+            "scene": {"enemies": args.enemies, "seed": args.seed, "frames": args.frames},
+            # Whatever the machine, the limits never allow less than 60 frames per second
+            "limits": {key: round(min(result[key] * args.headroom, 1000 / 60), 2) for key in ("mean_ms", "p95_ms")},
+            "min_peak_bullets": int(result["peak_bullets"] * 0.9),
+            "recorded": {"python": platform.python_version(), "platform": platform.platform(),
+                         **{key: round(value, 2) for key, value in result.items()}},
+        }
+        with open(args.budget, "w") as budget_file:
+            json.dump(budget, budget_file, indent=1)
+        print(f"recorded mean {result['mean_ms']:.2f}ms, p95 {result['p95_ms']:.2f}ms with "
+              f"{result['peak_bullets']} bullets at peak")
+        return
+
+    with open(args.budget) as budget_file:
+        budget = json.load(budget_file)
+    scene = budget["scene"]
+    result = measure(scene["frames"], scene["enemies"], scene["seed"])
+    print(f"mean {result['mean_ms']:.2f}ms, p95 {result['p95_ms']:.2f}ms, max {result['max_ms']:.2f}ms, "
+          f"{result['peak_bullets']} bullets at peak")
+    failures = check_budget(budget, result)
+    for failure in failures:
+        print(f"over budget: {failure}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# capture.py
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import pygame
+
+logger = logging.getLogger("8bit.capture")
+
+# Output kinds, chosen from the extension of the capture path
+IMAGE_EXTENSIONS = (".png", ".bmp", ".tga")
+RAW_EXTENSIONS = (".rgb", ".raw")
+
+
+class FrameCapture:
+    def __init__(self, path, screen, fps=60, pool_size=8, encoder="ffmpeg", encoder_args=None):
+        """
+        Initializes a recorder that streams frames to disk from a background thread.
+
+        The game loop only copies the screen into a free surface from a fixed pool and queues it. Encoding and
+        writing happen on the worker thread, or in the encoder process for videos. When every pooled surface is
+        still waiting to be written the frame is dropped instead of stalling the loop.
+
+        The kind of output follows from the path:
+            - "frames/%06d.png" (or .bmp, .tga): one image per frame named after the frame number, so dropped
+              frames show up as gaps; "_%06d" is added before the extension if the path has no pattern.
+            - "session.rgb" (or .raw): a single stream of raw RGB24 frames with no header.
+            - anything else, e.g. "session.mp4": raw frames piped to a local encoder such as ffmpeg.
+
+        Args:
+            path (str): Output path or image file pattern.
+            screen (pygame.Surface): The surface that will be captured; the pool copies its size and format.
+            fps (int): Frame rate written into videos.
+            pool_size (int): Number of frames that may wait for the worker.
+            encoder (str): Encoder executable for video output.
+            encoder_args (list): Encoder output options, a fast H.264 preset by default.
+
+        Raises:
+            FileNotFoundError: If video output is requested and the encoder is not installed.
+        """
+        self.path = path
+        self.size = size = screen.get_size()
+        self.fps = fps
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.__free = queue.SimpleQueue()  # Surfaces the game loop may copy into
+        for _ in range(pool_size):
+            self.__free.put(pygame.Surface(size, 0, screen))  # Same format as the screen, so copying is a memcpy
+        self.__frames = queue.Queue(maxsize=pool_size)  # (frame number, surface) waiting for the worker
+        self.__file = None
+        self.__process = None
+
+        root, extension = os.path.splitext(path)
+        extension = extension.lower()
+        if extension in IMAGE_EXTENSIONS:
+            if "%" not in path:
+                self.path = path = f"{root}_%06d{extension}"
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.__write = self.__write_image
+        elif extension in RAW_EXTENSIONS:
+            self.__file = open(path, "wb")
+            self.__write = self.__write_raw
+        else:
+            executable = shutil.which(encoder)
+            if executable is None:
+                raise FileNotFoundError(f"{encoder} is needed to encode {path}; capture to .png or .rgb instead")
+            width, height = size
+            args = encoder_args if encoder_args is not None else ["-c:v", "libx264", "-preset", "ultrafast",
+                                                                  "-pix_fmt", "yuv420p"]
+            self.__process = subprocess.Popen(
+                [executable, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                 "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", *args, path],
+                stdin=subprocess.PIPE)
+            self.__file = self.__process.stdin
+            self.__write = self.__write_raw
+
+        self.__thread = threading.Thread(target=self.__run, name="frame-capture", daemon=True)
+        self.__thread.start()
+
+    def capture(self, screen):
+        """
+        Copies the screen into a free pooled surface for the worker; nothing is encoded or written here.
+
+        Args:
+            screen (pygame.Surface): The surface to record, usually the display surface after drawing.
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped because the worker fell behind.
+        """
+        try:
+            surface = self.__free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        surface.blit(screen, (0, 0))
+        self.__frames.put_nowait((self.captured + self.dropped, surface))
+        self.captured += 1
+        return True
+
+    def __run(self):
+        while True:
+            item = self.__frames.get()
+            if item is None:
+                return
+            number, surface = item
+            try:
+                self.__write(number, surface)
+                self.written += 1
+            except (OSError, pygame.error):
+                logger.exception("could not write frame %d", number)
+            finally:
+                self.__free.put(surface)
+
+    def __write_image(self, number, surface):
+        pygame.image.save(surface, self.path % number)
+
+    def __write_raw(self, number, surface):
+        self.__file.write(pygame.image.tobytes(surface, "RGB"))
+
+    def close(self):
+        """
+        Writes the queued frames, then closes the output and waits for the encoder to finish.
+        """
+        if self.__thread is None:
+            return
+        self.__frames.put(None)
+        self.__thread.join()
+        self.__thread = None
+        if self.__file is not None:
+            self.__file.close()
+        if self.__process is not None:
+            self.__process.wait()
+        if self.dropped:
+            logger.warning("dropped %d of %d frames, the output could not keep up", self.dropped,
+                           self.captured + self.dropped)
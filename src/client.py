@@ -0,0 +1,94 @@
+# client.py
+import json
+import socket
+from simulation import Simulation
+from netsync import DeltaDecoder
+
+
+class GameClient:
+    def __init__(self, host="127.0.0.1", port=8765, timeout=5.0):
+        """
+        Connects to a GameServer and mirrors its match into a local simulation for drawing.
+
+        Args:
+            host (str): Address of the server.
+            port (int): TCP port of the server.
+            timeout (float): Seconds to wait for the connection and the server's welcome.
+
+        Raises:
+            ConnectionError: If the server refuses the connection, e.g. because the match is full.
+        """
+        self.__socket = socket.create_connection((host, port), timeout=timeout)
+        self.__buffer = b""
+        self.__sent_inputs = None
+        self.bytes_received = 0
+
+        welcome = self.__read_message()
+        if welcome.get("type") != "welcome":
+            self.close()
+            raise ConnectionError(welcome.get("message", "unexpected reply from server"))
+        self.player = welcome["player"]
+        # The mirror is never stepped, its entities are replaced by the server's state messages
+        self.simulation = Simulation(welcome["width"], welcome["height"], tick_rate=welcome["tick_rate"],
+                                     players=welcome["players"])
+        self.decoder = DeltaDecoder(self.simulation)
+        self.__socket.setblocking(False)
+
+    def __read_message(self):
+        while b"\n" not in self.__buffer:
+            data = self.__socket.recv(65536)
+            if not data:
+                raise ConnectionError("server closed the connection")
+            self.bytes_received += len(data)
+            self.__buffer += data
+        line, self.__buffer = self.__buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def poll(self):
+        """
+        Applies every state message received so far without blocking.
+
+        Returns:
+            int: Number of messages applied.
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+        """
+        try:
+            while True:
+                data = self.__socket.recv(65536)
+                if not data:
+                    raise ConnectionError("server closed the connection")
+                self.bytes_received += len(data)
+                self.__buffer += data
+        except BlockingIOError:
+            pass
+
+        *lines, self.__buffer = self.__buffer.split(b"\n")
+        for line in lines:
+            message = json.loads(line)
+            if message.get("type") == "state":
+                self.decoder.apply(message)
+        return len(lines)
+
+    def send_inputs(self, inputs):
+        """
+        Tells the server which INPUT_* flags the local player holds, only when they change.
+
+        Args:
+            inputs (int): Bitwise OR of the INPUT_* flags.
+        """
+        if inputs == self.__sent_inputs:
+            return
+        self.__socket.setblocking(True)
+        try:
+            self.__socket.sendall((json.dumps({"type": "input", "inputs": inputs}) + "\n").encode())
+        finally:
+            self.__socket.setblocking(False)
+        self.__sent_inputs = inputs
+
+    def close(self):
+        """
+        Disconnects from the server.
+        """
+        self.__socket.close()
@@ -0,0 +1,173 @@
+# collision.py
+INFINITY = float("inf")
+
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        """
+        Initializes a uniform-grid spatial hash used as the collision broad phase.
+
+        Args:
+            cell_size (int): Width and height of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.__cells = {}
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def clear(self):
+        """
+        Removes every item from the grid.
+        """
+        self.__cells.clear()
+        self.__count = 0
+
+    def insert(self, item, x, y, width, height):
+        """
+        Adds an item to every cell its bounding box overlaps.
+
+        Args:
+            item: The object to store.
+            x (int): Left edge of the bounding box.
+            y (int): Top edge of the bounding box.
+            width (int): Width of the bounding box.
+            height (int): Height of the bounding box.
+        """
+        cell_size = self.cell_size
+        entry = (self.__count, item)
+        self.__count += 1
+        for cx in range(int(x // cell_size), int((x + width) // cell_size) + 1):
+            for cy in range(int(y // cell_size), int((y + height) // cell_size) + 1):
+                cell = self.__cells.get((cx, cy))
+                if cell is None:
+                    self.__cells[(cx, cy)] = [entry]
+                else:
+                    cell.append(entry)
+
+    def query_entries(self, x, y, width, height):
+        """
+        Returns the raw entries of every cell overlapped by a bounding box, without removing duplicates.
+
+        Duplicates are left to the caller, which keeps the query cheap in hot loops: an item spanning several
+        of the cells appears once per cell, and the returned list may be the grid's own storage, so it must not
+        be modified.
+
+        Args:
+            x (int): Left edge of the bounding box.
+            y (int): Top edge of the bounding box.
+            width (int): Width of the bounding box.
+            height (int): Height of the bounding box.
+
+        Returns:
+            list: (insertion index, item) pairs.
+        """
+        cell_size = self.cell_size
+        cells = self.__cells
+        left, right = int(x // cell_size), int((x + width) // cell_size)
+        top, bottom = int(y // cell_size), int((y + height) // cell_size)
+        if left == right and top == bottom:
+            return cells.get((left, top), ())
+        entries = []
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    entries += cell
+        return entries
+
+
+def swept_aabb(ax, ay, aw, ah, dx, dy, bx, by, bw, bh):
+    """
+    Finds when a box moving along a segment first overlaps a static box.
+
+    Box A starts at (ax, ay) and moves by (dx, dy) over the tick; box B stays put. Boxes that only touch
+    along an edge do not overlap.
+
+    Args:
+        ax (float): Left edge of the moving box at the start of the tick.
+        ay (float): Top edge of the moving box at the start of the tick.
+        aw (float): Width of the moving box.
+        ah (float): Height of the moving box.
+        dx (float): Horizontal displacement over the tick.
+        dy (float): Vertical displacement over the tick.
+        bx (float): Left edge of the static box.
+        by (float): Top edge of the static box.
+        bw (float): Width of the static box.
+        bh (float): Height of the static box.
+
+    Returns:
+        float: Fraction of the tick in [0, 1) at which the boxes start to overlap, or None if they never do.
+    """
+    if dx:
+        enter_x = (bx - ax - aw) / dx
+        exit_x = (bx + bw - ax) / dx
+        if enter_x > exit_x:
+            enter_x, exit_x = exit_x, enter_x
+    elif ax < bx + bw and bx < ax + aw:
+        enter_x, exit_x = -INFINITY, INFINITY
+    else:
+        return None
+
+    if dy:
+        enter_y = (by - ay - ah) / dy
+        exit_y = (by + bh - ay) / dy
+        if enter_y > exit_y:
+            enter_y, exit_y = exit_y, enter_y
+    elif ay < by + bh and by < ay + ah:
+        enter_y, exit_y = -INFINITY, INFINITY
+    else:
+        return None
+
+    enter = enter_x if enter_x > enter_y else enter_y
+    exit_ = exit_x if exit_x < exit_y else exit_y
+    if enter >= exit_ or enter >= 1 or exit_ <= 0:
+        return None
+    return enter if enter > 0 else 0.0
+
+
+def sweep_bounds(entity, height):
+    """
+    Returns the box covered by an entity over the current tick, from its previous to its current position.
+
+    Args:
+        entity: An object with x, y, prev_x, prev_y and width attributes.
+        height (float): Vertical extent of the entity.
+
+    Returns:
+        tuple: (x, y, width, height) of the covered box.
+    """
+    x, y, prev_x, prev_y = entity.x, entity.y, entity.prev_x, entity.prev_y
+    width = entity.width
+    if prev_x < x:
+        width += x - prev_x
+        x = prev_x
+    else:
+        width += prev_x - x
+    if prev_y < y:
+        height += y - prev_y
+        y = prev_y
+    else:
+        height += prev_y - y
+    return x, y, width, height
+
+
+def projectile_hit_time(projectile, target):
+    """
+    Finds when a projectile first overlaps a target during the current tick.
+
+    Both objects may have moved since the previous tick, so the projectile's full box is swept along its
+    movement relative to the target. This catches hits however far either of them moved in one tick.
+
+    Args:
+        projectile (Projectile): The projectile, whose vertical extent is its length.
+        target: An Enemy or Spaceship with x, y, prev_x, prev_y, width and height attributes.
+
+    Returns:
+        float: Fraction of the tick in [0, 1) at which the hit happens, or None if there is none.
+    """
+    return swept_aabb(projectile.prev_x, projectile.prev_y, projectile.width, projectile.length,
+                      (projectile.x - projectile.prev_x) - (target.x - target.prev_x),
+                      (projectile.y - projectile.prev_y) - (target.y - target.prev_y),
+                      target.prev_x, target.prev_y, target.width, target.height)
@@ -0,0 +1,178 @@
+# controls.py
+import json
+import time
+from collections import deque
+import pygame
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_SHOOT, INPUT_RESTART
+
+# Action names used in binding files
+ACTIONS = {"left": INPUT_LEFT, "right": INPUT_RIGHT, "shoot": INPUT_SHOOT, "restart": INPUT_RESTART}
+
+DEFAULT_KEY_BINDINGS = {
+    pygame.K_LEFT: INPUT_LEFT,
+    pygame.K_RIGHT: INPUT_RIGHT,
+    pygame.K_SPACE: INPUT_SHOOT,
+    pygame.K_r: INPUT_RESTART,
+}
+
+# Gamepad buttons in the common XInput layout: A and B shoot, Start restarts
+DEFAULT_BUTTON_BINDINGS = {0: INPUT_SHOOT, 1: INPUT_SHOOT, 7: INPUT_RESTART}
+
+
+def load_bindings(path):
+    """
+    Loads remapped controls from a JSON file.
+
+    The file maps key names (as understood by pygame.key.key_code, e.g. "a" or "left") and gamepad button
+    numbers to action names: {"keys": {"a": "left", "d": "right"}, "buttons": {"2": "shoot"}}. Each section
+    that is present replaces the corresponding default bindings.
+
+    Args:
+        path (str): Path of the binding file.
+
+    Returns:
+        tuple: (key_bindings, button_bindings), either None if the file does not define it.
+
+    Raises:
+        ValueError: If a key or action name is unknown.
+    """
+    with open(path) as bindings_file:
+        table = json.load(bindings_file)
+
+    def actions(name):
+        try:
+            return ACTIONS[name]
+        except KeyError:
+            raise ValueError(f"Unknown action {name!r}, expected one of {', '.join(ACTIONS)}") from None
+
+    key_bindings = button_bindings = None
+    if "keys" in table:
+        pygame.display.init()  # Key names are resolved by the video subsystem
+        key_bindings = {}
+        for key_name, action in table["keys"].items():
+            key = pygame.key.key_code(key_name)
+            key_bindings[key] = key_bindings.get(key, 0) | actions(action)
+    if "buttons" in table:
+        button_bindings = {}
+        for button, action in table["buttons"].items():
+            button_bindings[int(button)] = button_bindings.get(int(button), 0) | actions(action)
+    return key_bindings, button_bindings
+
+
+class Controls:
+    def __init__(self, key_bindings=None, button_bindings=None, axis_dead_zone=0.5):
+        """
+        Initializes an input layer that turns keyboard and gamepad events into INPUT_* flags per tick.
+
+        Events are queued with the time they were read and consumed by the next tick. A tick sees every flag
+        held at its start or pressed since the previous tick, so a tap released before the tick still counts.
+        The bindings are plain dicts and may be changed at any time.
+
+        Args:
+            key_bindings (dict): pygame key code -> INPUT_* flags, DEFAULT_KEY_BINDINGS if omitted.
+            button_bindings (dict): Gamepad button number -> INPUT_* flags, DEFAULT_BUTTON_BINDINGS if omitted.
+            axis_dead_zone (float): Stick deflection below which the horizontal axis counts as centered.
+        """
+        self.key_bindings = dict(key_bindings if key_bindings is not None else DEFAULT_KEY_BINDINGS)
+        self.button_bindings = dict(button_bindings if button_bindings is not None else DEFAULT_BUTTON_BINDINGS)
+        self.axis_dead_zone = axis_dead_zone
+        self.held = 0  # Flags held after the events consumed so far
+        self.latency_ms = 0.0  # How long the oldest event consumed by the last tick had been waiting
+        self.gamepads_enabled = False
+        self.__queue = deque()  # (read time, control, flags held through the control after the event)
+        self.__down = {}  # Control -> flags it currently holds
+        self.__joysticks = {}  # Instance id -> pygame.joystick.Joystick, kept open to receive its events
+
+    def enable_gamepads(self):
+        """
+        Starts the joystick module, so connected and later plugged-in gamepads send events.
+        """
+        if not self.gamepads_enabled:
+            pygame.joystick.init()
+            self.gamepads_enabled = True
+            # SDL reports the gamepads that are already connected with JOYDEVICEADDED events
+
+    def push(self, event, timestamp=None):
+        """
+        Queues a pygame event if it is bound to an action.
+
+        Args:
+            event (pygame.event.Event): The event.
+            timestamp (float): perf_counter time the event was read, now if omitted.
+
+        Returns:
+            bool: True if the event was consumed.
+        """
+        if event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+            flags = self.key_bindings.get(event.key)
+            if flags is None:
+                return False
+            self.__enqueue(timestamp, ("key", event.key), flags if event.type == pygame.KEYDOWN else 0)
+        elif event.type == pygame.JOYBUTTONDOWN or event.type == pygame.JOYBUTTONUP:
+            flags = self.button_bindings.get(event.button)
+            if flags is None:
+                return False
+            self.__enqueue(timestamp, ("button", event.instance_id, event.button),
+                           flags if event.type == pygame.JOYBUTTONDOWN else 0)
+        elif event.type == pygame.JOYAXISMOTION:
+            if event.axis != 0:
+                return False
+            flags = INPUT_LEFT if event.value < -self.axis_dead_zone else (
+                INPUT_RIGHT if event.value > self.axis_dead_zone else 0)
+            self.__enqueue(timestamp, ("axis", event.instance_id), flags)
+        elif event.type == pygame.JOYHATMOTION:
+            x = event.value[0]
+            flags = INPUT_LEFT if x < 0 else (INPUT_RIGHT if x > 0 else 0)
+            self.__enqueue(timestamp, ("hat", event.instance_id, event.hat), flags)
+        elif event.type == pygame.JOYDEVICEADDED:
+            joystick = pygame.joystick.Joystick(event.device_index)
+            self.__joysticks[joystick.get_instance_id()] = joystick
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self.__joysticks.pop(event.instance_id, None)
+            self.__enqueue(timestamp, ("removed", event.instance_id), 0)
+        else:
+            return False
+        return True
+
+    def __enqueue(self, timestamp, control, flags):
+        self.__queue.append((timestamp if timestamp is not None else time.perf_counter(), control, flags))
+
+    def take(self):
+        """
+        Consumes the queued events for one simulation tick.
+
+        Returns:
+            int: Bitwise OR of the INPUT_* flags held or pressed since the previous tick.
+        """
+        queue = self.__queue
+        if not queue:
+            self.latency_ms = 0.0
+            return self.held
+        down = self.__down
+        self.latency_ms = (time.perf_counter() - queue[0][0]) * 1000
+        pressed = 0
+        while queue:
+            _, control, flags = queue.popleft()
+            if flags:
+                pressed |= flags
+                down[control] = flags
+            elif control[0] == "removed":
+                # Release whatever the unplugged gamepad was holding
+                for held_control in [held_control for held_control in down
+                                     if held_control[0] != "key" and held_control[1] == control[1]]:
+                    del down[held_control]
+            else:
+                down.pop(control, None)
+        held = 0
+        for flags in down.values():
+            held |= flags
+        self.held = held
+        return held | pressed
+
+    def clear(self):
+        """
+        Drops the queued events and releases everything, e.g. when the window loses focus.
+        """
+        self.__queue.clear()
+        self.__down.clear()
+        self.held = 0
@@ -1,9 +1,18 @@
 # enemy.py
-import pygame
 from projectile import Projectile
+from collision import projectile_hit_time
+from enemy_behaviour import EnemyPath
+
+NO_SEGMENT = (0, 0, 0, 0, 0)  # Ends before the first move, so the first move looks the path up
+
 
 class Enemy:
-    def __init__(self, eid, x, y, speed, shoot_rate):
+    # Slots keep enemies small and make the hot fields plain attribute reads instead of property calls
+    __slots__ = ("eid", "wave", "x", "y", "prev_x", "prev_y", "width", "height", "speed", "shoot_rate",
+                 "is_alive", "next_shot_tick", "moves", "__last_shot_time", "__color", "__destroyed_time",
+                 "__direction", "__origin", "__path", "__segment")
+
+    def __init__(self, eid, x, y, speed, shoot_rate, wave=None):
         """
         Initializes an enemy with specified characteristics.
 
@@ -13,83 +22,28 @@ class Enemy:
             y (int): Initial y-coordinate.
             speed (int): Speed of the enemy.
             shoot_rate (int): Rate at which the enemy can shoot projectiles.
+            wave (int): Index of the wave the enemy belongs to.
         """
-        self.__eid = eid
-        self.__x = x
-        self.__y = y
-        self.__width = 50
-        self.__height = 50
-        self.__speed = speed
-        self.__shoot_rate = shoot_rate
+        self.eid = eid
+        self.wave = wave
+        self.x = x
+        self.y = y
+        self.prev_x = x  # Position at the start of the last move, used by the swept collision tests
+        self.prev_y = y
+        self.width = 50
+        self.height = 50
+        self.speed = speed
+        self.shoot_rate = shoot_rate
+        self.is_alive = True
         self.__last_shot_time = 0
-        self.__is_alive = True
         self.__color = (255, 0, 0)
         self.__destroyed_time = None
         self.__direction = -1
-
-    @property
-    def eid(self):
-        return self.__eid
-
-    @eid.setter
-    def eid(self, new_eid):
-        self.__eid = new_eid
-
-    @property
-    def x(self):
-        return self.__x
-
-    @x.setter
-    def x(self, new_x):
-        self.__x = new_x
-
-    @property
-    def y(self):
-        return self.__y
-
-    @y.setter
-    def y(self, new_y):
-        self.__y = new_y
-
-    @property
-    def width(self):
-        return self.__width
-
-    @width.setter
-    def width(self, new_width):
-        self.__width = new_width
-
-    @property
-    def height(self):
-        return self.__height
-
-    @height.setter
-    def height(self, new_height):
-        self.__height = new_height
-
-    @property
-    def speed(self):
-        return self.__speed
-
-    @speed.setter
-    def speed(self, new_speed):
-        self.__speed = new_speed
-
-    @property
-    def shoot_rate(self):
-        return self.__shoot_rate
-
-    @shoot_rate.setter
-    def shoot_rate(self, new_shoot_rate):
-        self.__shoot_rate = new_shoot_rate
-
-    @property
-    def is_alive(self):
-        return self.__is_alive
-
-    @is_alive.setter
-    def is_alive(self, new_is_alive):
-        self.__is_alive = new_is_alive
+        self.next_shot_tick = 0  # First tick worth calling shoot_projectile at, maintained by the simulation
+        self.__origin = (x, y, self.__direction)  # State the path starts from, the spawn state
+        self.__path = None  # Solved from __origin on the first move, once the field size is known
+        self.moves = 0  # Moves along the path since __origin
+        self.__segment = NO_SEGMENT  # Straight part of the path the enemy is on, see EnemyPath.segment_at
 
     def get_color(self):
         """
@@ -109,69 +63,156 @@ class Enemy:
         """
         return self.__destroyed_time
 
-    def move(self):
+    def get_last_shot_time(self):
+        """
+        Returns the time of the enemy's last shot.
+
+        Returns:
+            float: Time in milliseconds.
         """
-        Moves the enemy horizontally, handles boundary conditions, and resets position if necessary.
+        return self.__last_shot_time
+
+    def get_state(self):
         """
-        if self.__is_alive:
-            self.__x += self.__speed * self.__direction
+        Returns the complete state of the enemy, e.g. for snapshots.
 
-            if self.__x < 0 or self.__x > pygame.display.get_surface().get_width() - self.__width:
-                self.__direction *= -1
-                self.__x = max(0, min(self.__x, pygame.display.get_surface().get_width() - self.__width))
+        Returns:
+            tuple: (eid, wave, x, y, prev_x, prev_y, width, height, speed, shoot_rate, is_alive, last_shot_time,
+            color, destroyed_time, direction, origin, moves), where origin is the (x, y, direction) the path
+            started from and moves the number of moves made along it.
+        """
+        return (self.eid, self.wave, self.x, self.y, self.prev_x, self.prev_y, self.width, self.height, self.speed,
+                self.shoot_rate, self.is_alive, self.__last_shot_time, self.__color, self.__destroyed_time,
+                self.__direction, self.__origin, self.moves)
 
-            self.__y = max(self.__y, 0)
+    def set_state(self, state):
+        """
+        Overwrites the complete state of the enemy.
 
-            if self.__x < 0:
-                self.__x = pygame.display.get_surface().get_width()
-                self.__y = pygame.display.get_surface().get_height() // 4
+        Args:
+            state (tuple): A state as returned by get_state.
+        """
+        (self.eid, self.wave, self.x, self.y, self.prev_x, self.prev_y, self.width, self.height, self.speed,
+         self.shoot_rate, self.is_alive, self.__last_shot_time, self.__color, self.__destroyed_time,
+         self.__direction, self.__origin, self.moves) = state
+        self.next_shot_tick = 0
+        self.__path = None
+        self.__segment = NO_SEGMENT
+
+    def move(self, screen_width, screen_height, current_time):
+        """
+        Moves the enemy one tick along its bounce path.
+
+        Args:
+            screen_width (int): Width of the playing field.
+            screen_height (int): Height of the playing field.
+            current_time (float): Current simulation time in milliseconds.
+        """
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.is_alive:
+            self.moves = moves = self.moves + 1
+            segment = self.__segment
+            if moves >= segment[1]:
+                # Only a turn needs the path; in between the position follows from the segment
+                segment = self.enter_segment(moves, screen_width)
+            self.x = segment[2] + (moves - segment[0]) * segment[3]
+            self.y = max(self.y, 0)
         elif self.__destroyed_time is not None:
-            current_time = pygame.time.get_ticks()
             time_since_destroyed = current_time - self.__destroyed_time
             if time_since_destroyed >= 1000:
-                self.__is_alive = False
+                self.is_alive = False
+
+    def position_at(self, moves, screen_width):
+        """
+        Predicts where the enemy will be after a number of further moves, without moving it.
+
+        Args:
+            moves (int): Number of moves ahead, or back as long as that stays after the enemy spawned.
+            screen_width (int): Width of the playing field.
+
+        Returns:
+            tuple: (x, y)
 
-    def shoot_projectile(self):
+        Raises:
+            ValueError: If moves goes back past the spawn of the enemy.
+        """
+        if self.moves + moves < 0:
+            raise ValueError(f"Cannot go back {-moves} moves, the enemy has only moved {self.moves} times")
+        x, y, _ = self.__get_path(screen_width).state_at(self.moves + moves)
+        return x, y
+
+    def enter_segment(self, moves, screen_width):
+        """
+        Makes the straight segment of the path that a move count falls on the enemy's current one.
+
+        Args:
+            moves (int): Number of moves along the path since the spawn.
+            screen_width (int): Width of the playing field.
+
+        Returns:
+            tuple: (start, end, x, velocity, direction), see EnemyPath.segment_at.
+        """
+        segment = self.__segment = self.__get_path(screen_width).segment_at(moves)
+        self.__direction = segment[4]
+        return segment
+
+    def __get_path(self, screen_width):
+        if self.__path is None:
+            self.__path = EnemyPath(*self.__origin, self.speed, self.width, screen_width)
+        return self.__path
+
+    def shoot_projectile(self, current_time, pool=None):
         """
         Fires a projectile if the enemy is alive and enough time has passed since the last shot.
 
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+            pool (ProjectilePool): Optional pool to take the projectile from.
+
         Returns:
             Projectile: A new projectile if conditions are met, otherwise None.
         """
-        if self.__is_alive:
-            current_time = pygame.time.get_ticks()
+        if self.is_alive:
             time_since_last_shot = current_time - self.__last_shot_time
 
-            if time_since_last_shot > self.__shoot_rate:
-                projectile = Projectile(x=self.__x + self.__width // 2 - 5,
-                                        y=self.__y - 20,
-                                        width=10,
-                                        height=20,
-                                        speed=8,
-                                        length=20,
-                                        direction="down")
+            if time_since_last_shot > self.shoot_rate:
+                make_projectile = pool.acquire if pool is not None else Projectile
+                projectile = make_projectile(x=self.x + self.width // 2 - 5,
+                                             y=self.y - 20,
+                                             width=10,
+                                             height=20,
+                                             speed=8,
+                                             length=20,
+                                             direction="down")
                 self.__last_shot_time = current_time
                 return projectile
             else:
                 return None
 
-    def is_hit_by_player(self, projectile):
+    def is_hit_by_player(self, projectile, current_time):
         """
-        Checks if the enemy is hit by a player's projectile.
+        Checks if the enemy is hit by a player's projectile at any point of the current tick.
 
         Args:
             projectile (Projectile): The player's projectile.
+            current_time (float): Current simulation time in milliseconds.
 
         Returns:
             bool: True if hit, False otherwise.
         """
-        if self.__is_alive:
-            hit_condition = (self.__x < projectile.x < self.__x + self.__width) and (
-                        self.__y < projectile.y < self.__y + self.__height)
-            if hit_condition:
-                self.__is_alive = False
-                self.__color = (0, 0, 0)
-                self.__destroyed_time = pygame.time.get_ticks()
-            return hit_condition
-        else:
-            return False
+        if self.is_alive and projectile_hit_time(projectile, self) is not None:
+            self.destroy(current_time)
+            return True
+        return False
+
+    def destroy(self, current_time):
+        """
+        Marks the enemy as destroyed.
+
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+        """
+        self.is_alive = False
+        self.__color = (0, 0, 0)
+        self.__destroyed_time = current_time
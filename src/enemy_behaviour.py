@@ -0,0 +1,148 @@
+# enemy_behaviour.py
+
+
+def _moves_until_turn(x, velocity, max_x):
+    """
+    Solves for the first move after which an enemy moving in a straight line leaves the field.
+
+    The estimate from the division is corrected with the same comparison the path uses, so the result holds
+    exactly for the positions x + moves * velocity.
+
+    Args:
+        x (float): Starting x-coordinate.
+        velocity (float): Signed distance covered per move.
+        max_x (float): Largest x-coordinate inside the field.
+
+    Returns:
+        int: Number of moves, or None if the enemy never leaves the field.
+    """
+    position = x + velocity
+    if position < 0 or position > max_x:
+        return 1
+    if velocity == 0:
+        return None
+    moves = max(int((max_x - x) // velocity if velocity > 0 else x // -velocity) + 1, 2)
+    while moves > 2 and not 0 <= x + (moves - 1) * velocity <= max_x:
+        moves -= 1
+    while 0 <= x + moves * velocity <= max_x:
+        moves += 1
+    return moves
+
+
+class EnemyPath:
+    __slots__ = ("y", "starts", "segments", "cycle_start", "period")
+
+    def __init__(self, x, y, direction, speed, width, screen_width):
+        """
+        Solves the bounce path of an enemy from its starting state.
+
+        An enemy moves speed * direction pixels per move and turns around when it leaves the field, landing on
+        the wall it crossed. The path is therefore a few straight segments: the one from the start to the first
+        wall, then the runs between the two walls, which repeat. The segments and the period are solved for up
+        front, so any position is a constant-time evaluation and the path needs no per-move storage.
+
+        Positions are evaluated as segment start + moves * velocity rather than summed move by move. That is
+        the same for integer speeds; for fractional speeds the last bits can differ from summing, and the game,
+        replays and snapshots all use this evaluation.
+
+        Args:
+            x (float): Starting x-coordinate.
+            y (float): Starting y-coordinate.
+            direction (int): Starting horizontal direction, 1 or -1.
+            speed (float): Speed of the enemy.
+            width (int): Width of the enemy.
+            screen_width (int): Width of the playing field.
+        """
+        max_x = screen_width - width
+        velocity = speed * direction
+        self.y = y
+        self.starts = [0]  # First move of each segment
+        self.segments = [(x, velocity, direction)]  # x at the first move, velocity and direction of each segment
+        self.cycle_start = None  # First move of the repeating part, None if the enemy stops turning
+        self.period = 0
+        seen = {}  # Segment -> its index, a repeated one closes the cycle
+        start = 0
+        while True:
+            moves = _moves_until_turn(x, velocity, max_x)
+            if moves is None:
+                break
+            start += moves
+            x = max(0, min(x + moves * velocity, max_x))
+            velocity = -velocity
+            direction = -direction
+            segment = (x, velocity, direction)
+            if segment in seen:
+                self.cycle_start = self.starts[seen[segment]]
+                self.period = start - self.cycle_start
+                break
+            seen[segment] = len(self.segments)
+            self.starts.append(start)
+            self.segments.append(segment)
+
+    def segment_at(self, moves):
+        """
+        Returns the straight segment of the path that a number of moves falls on.
+
+        The position after those moves is x + (moves - start) * velocity, and stays on this segment until end.
+
+        Args:
+            moves (int): Number of moves, at least 0.
+
+        Returns:
+            tuple: (start, end, x, velocity, direction), with start and end counted in moves from the start.
+        """
+        starts = self.starts
+        offset = 0
+        if self.cycle_start is not None and moves >= self.cycle_start:
+            offset = (moves - self.cycle_start) // self.period * self.period
+            moves -= offset
+        index = len(starts) - 1
+        while starts[index] > moves:
+            index -= 1
+        if index + 1 < len(starts):
+            end = starts[index + 1]
+        elif self.cycle_start is not None:
+            end = self.cycle_start + self.period
+        else:
+            end = float("inf")
+        return (starts[index] + offset, end + offset, *self.segments[index])
+
+    def state_at(self, moves):
+        """
+        Returns the state after a number of moves from the starting state.
+
+        Args:
+            moves (int): Number of moves, at least 0.
+
+        Returns:
+            tuple: (x, y, direction)
+        """
+        start, _, x, velocity, direction = self.segment_at(moves)
+        if moves == 0:
+            return x, self.y, direction
+        return x + (moves - start) * velocity, max(self.y, 0), direction
+
+
+def next_shot_tick(last_shot_time, shoot_rate, tick_ms, time_offset=0):
+    """
+    Solves for the first tick at which an enemy may shoot again.
+
+    Enemies shoot once more than shoot_rate milliseconds have passed since their last shot, and the simulation
+    time of a tick is tick * tick_ms + time_offset. The estimate is corrected with that exact float
+    comparison, so the result matches checking the enemy every tick.
+
+    Args:
+        last_shot_time (float): Simulation time of the enemy's last shot in milliseconds.
+        shoot_rate (float): Minimum milliseconds between shots.
+        tick_ms (float): Simulated milliseconds per tick.
+        time_offset (float): Simulation time offset, see Simulation.time_offset.
+
+    Returns:
+        int: The tick.
+    """
+    tick = int((last_shot_time + shoot_rate - time_offset) // tick_ms)
+    while tick * tick_ms + time_offset - last_shot_time <= shoot_rate:
+        tick += 1
+    while (tick - 1) * tick_ms + time_offset - last_shot_time > shoot_rate:
+        tick -= 1
+    return tick
@@ -0,0 +1,912 @@
+# entity_store.py
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the object-based game loop does not need it
+    np = None
+from enemy import Enemy
+from projectile import Projectile
+
+
+class EntityView:
+    def __init__(self, store, index):
+        """
+        Initializes a lightweight view onto one slot of an EntityStore.
+
+        Args:
+            store (EntityStore): The store holding the entity's data.
+            index (int): Slot index of the entity.
+        """
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.store.x[self.index])
+
+    @x.setter
+    def x(self, new_x):
+        self.store.x[self.index] = new_x
+
+    @property
+    def y(self):
+        return float(self.store.y[self.index])
+
+    @y.setter
+    def y(self, new_y):
+        self.store.y[self.index] = new_y
+
+    @property
+    def width(self):
+        return float(self.store.width[self.index])
+
+    @property
+    def height(self):
+        return float(self.store.height[self.index])
+
+    @property
+    def length(self):
+        """Alias used by projectile drawing code."""
+        return self.height
+
+    @property
+    def is_alive(self):
+        return bool(self.store.alive[self.index])
+
+
+class EntityStore:
+    def __init__(self, capacity=256, columns=()):
+        """
+        Initializes a structure-of-arrays store for batch-updated entities.
+
+        Args:
+            capacity (int): Number of slots to allocate up front; the store grows on demand.
+            columns (tuple): Names of extra per-entity float arrays, which start at 0 for every new entity.
+        """
+        if np is None:
+            raise ImportError("EntityStore requires numpy")
+        self.capacity = 0
+        self.count = 0  # Number of slots ever used; slots past this are untouched
+        self.columns = tuple(columns)
+        self.__free = []
+        self.__spawned = 0  # Entities ever spawned, numbering them in spawn order
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)  # Position before the last move, for swept collision tests
+        self.prev_y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.width = np.zeros(0)
+        self.height = np.zeros(0)
+        self.timer = np.zeros(0)  # Time of the last timed action, e.g. the last shot
+        self.period = np.zeros(0)  # Interval between timed actions, e.g. the shoot rate
+        self.alive = np.zeros(0, dtype=bool)
+        self.serial = np.zeros(0, dtype=np.int64)  # Spawn number of the entity in each slot
+        for name in self.columns:
+            setattr(self, name, np.zeros(0))
+        self.__grow(max(capacity, 1))
+
+    def __grow(self, new_capacity):
+        """
+        Reallocates every array to hold new_capacity slots.
+
+        Args:
+            new_capacity (int): New number of slots.
+        """
+        for name in ("x", "y", "prev_x", "prev_y", "vx", "vy", "width", "height", "timer", "period", "alive",
+                     "serial") + self.columns:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def spawn(self, x, y, width, height, vx=0.0, vy=0.0, period=0.0, timer=0.0):
+        """
+        Adds an entity, reusing a dead slot when one is available.
+
+        Args:
+            x (float): Initial x-coordinate.
+            y (float): Initial y-coordinate.
+            width (float): Width of the entity.
+            height (float): Height of the entity.
+            vx (float): Horizontal velocity in pixels per tick.
+            vy (float): Vertical velocity in pixels per tick.
+            period (float): Interval between timed actions in milliseconds.
+            timer (float): Time of the last timed action in milliseconds.
+
+        Returns:
+            int: Slot index of the new entity.
+        """
+        if self.__free:
+            index = self.__free.pop()
+        else:
+            if self.count == self.capacity:
+                self.__grow(self.capacity * 2)
+            index = self.count
+            self.count += 1
+
+        self.x[index] = self.prev_x[index] = x
+        self.y[index] = self.prev_y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.width[index] = width
+        self.height[index] = height
+        self.period[index] = period
+        self.timer[index] = timer
+        self.alive[index] = True
+        self.serial[index] = self.__spawned
+        self.__spawned += 1
+        for name in self.columns:
+            getattr(self, name)[index] = 0
+        return index
+
+    def spawn_many(self, x, y, width, height, vx=0.0, vy=0.0, period=0.0, timer=0.0):
+        """
+        Adds several entities at once, reusing dead slots first.
+
+        Every argument is either an array with one value per entity or a scalar shared by all of them.
+
+        Args:
+            x (numpy.ndarray): Initial x-coordinates; their length is the number of entities.
+            y (numpy.ndarray): Initial y-coordinates.
+            width (float): Widths of the entities.
+            height (float): Heights of the entities.
+            vx (numpy.ndarray): Horizontal velocities in pixels per tick.
+            vy (numpy.ndarray): Vertical velocities in pixels per tick.
+            period (float): Intervals between timed actions in milliseconds.
+            timer (float): Times of the last timed action in milliseconds.
+
+        Returns:
+            numpy.ndarray: Slot indices of the new entities.
+        """
+        total = len(x)
+        indices = np.empty(total, dtype=np.intp)
+        reused = min(total, len(self.__free))
+        if reused:
+            indices[:reused] = self.__free[-reused:]
+            del self.__free[-reused:]
+        fresh = total - reused
+        if fresh:
+            new_capacity = self.capacity
+            while self.count + fresh > new_capacity:
+                new_capacity *= 2
+            if new_capacity != self.capacity:
+                self.__grow(new_capacity)
+            indices[reused:] = np.arange(self.count, self.count + fresh)
+            self.count += fresh
+
+        self.x[indices] = self.prev_x[indices] = x
+        self.y[indices] = self.prev_y[indices] = y
+        self.vx[indices] = vx
+        self.vy[indices] = vy
+        self.width[indices] = width
+        self.height[indices] = height
+        self.period[indices] = period
+        self.timer[indices] = timer
+        self.alive[indices] = True
+        self.serial[indices] = np.arange(self.__spawned, self.__spawned + total)
+        self.__spawned += total
+        for name in self.columns:
+            getattr(self, name)[indices] = 0
+        return indices
+
+    def kill(self, index):
+        """
+        Marks an entity dead and frees its slot.
+
+        Args:
+            index (int): Slot index of the entity.
+        """
+        if self.alive[index]:
+            self.alive[index] = False
+            self.__free.append(int(index))
+
+    def kill_many(self, indices):
+        """
+        Marks several entities dead and frees their slots.
+
+        Args:
+            indices (numpy.ndarray): Slot indices of the entities.
+        """
+        indices = indices[self.alive[indices]]
+        self.alive[indices] = False
+        self.__free.extend(indices.tolist())
+
+    def clear(self):
+        """
+        Removes every entity.
+        """
+        self.alive[:] = False
+        self.count = 0
+        self.__free.clear()
+
+    def view(self, index):
+        """
+        Returns an object-style view of one entity.
+
+        Args:
+            index (int): Slot index of the entity.
+
+        Returns:
+            EntityView: A view exposing x, y, width, height and is_alive.
+        """
+        return EntityView(self, index)
+
+    def active_indices(self):
+        """
+        Returns the slot indices of every live entity.
+
+        Returns:
+            numpy.ndarray: Indices of live entities.
+        """
+        return np.flatnonzero(self.alive[:self.count])
+
+    def ordered_indices(self):
+        """
+        Returns the slot indices of every live entity in the order the entities were spawned.
+
+        Slots are reused, so slot order says nothing about age; this is the order a list appended to on every
+        spawn would have.
+
+        Returns:
+            numpy.ndarray: Indices of live entities, oldest first.
+        """
+        indices = self.active_indices()
+        return indices[np.argsort(self.serial[indices], kind="stable")]
+
+    def move(self):
+        """
+        Advances every live entity by its velocity.
+        """
+        n = self.count
+        alive = self.alive[:n]
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * alive
+        self.y[:n] += self.vy[:n] * alive
+
+    def bounce(self, screen_width):
+        """
+        Moves live entities horizontally and reverses them at the screen edges, one step at a time.
+
+        This is the rule enemy paths are solved from; StoredEntities moves enemies along the solved paths instead,
+        which keeps fractional speeds exactly in step with Enemy.move.
+
+        Args:
+            screen_width (int): Width of the screen.
+        """
+        n = self.count
+        alive = self.alive[:n]
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        x = self.x[:n]
+        vx = self.vx[:n]
+        max_x = screen_width - self.width[:n]
+        x += vx * alive
+        out = alive & ((x < 0) | (x > max_x))
+        vx[out] *= -1
+        np.clip(x, 0, max_x, out=x, where=out)
+        np.maximum(self.y[:n], 0, out=self.y[:n], where=alive)
+
+    def off_screen(self, screen_width, screen_height):
+        """
+        Flags the live entities that have fully left the screen, like Projectile.is_off_screen.
+
+        Args:
+            screen_width (int): Width of the screen.
+            screen_height (int): Height of the screen.
+
+        Returns:
+            numpy.ndarray: One boolean per slot up to count.
+        """
+        n = self.count
+        return self.alive[:n] & ((self.y[:n] + self.height[:n] < 0) | (self.y[:n] > screen_height) |
+                                 (self.x[:n] + self.width[:n] < 0) | (self.x[:n] > screen_width))
+
+    def cull(self, screen_width, screen_height):
+        """
+        Kills live entities that have fully left the screen.
+
+        Args:
+            screen_width (int): Width of the screen.
+            screen_height (int): Height of the screen.
+
+        Returns:
+            int: Number of entities culled.
+        """
+        indices = np.flatnonzero(self.off_screen(screen_width, screen_height))
+        self.kill_many(indices)
+        return len(indices)
+
+    def due(self, current_time):
+        """
+        Returns live entities whose timed action is due and restarts their timers.
+
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+
+        Returns:
+            numpy.ndarray: Indices of entities that act this tick.
+        """
+        n = self.count
+        ready = np.flatnonzero(self.alive[:n] & (current_time - self.timer[:n] > self.period[:n]))
+        self.timer[ready] = current_time
+        return ready
+
+    def hits(self, point_x, point_y):
+        """
+        Finds, for each point, the first live entity whose box strictly contains it.
+
+        This is a batch point test; the game itself uses swept box tests, see StoredEntities.enemy_hits.
+
+        Args:
+            point_x (numpy.ndarray): X-coordinates of the points, e.g. projectile positions.
+            point_y (numpy.ndarray): Y-coordinates of the points.
+
+        Returns:
+            tuple: (point_indices, entity_indices) of every point that hit something.
+        """
+        targets = self.active_indices()
+        if len(targets) == 0 or len(point_x) == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        left = self.x[targets]
+        top = self.y[targets]
+        px = np.asarray(point_x)[:, None]
+        py = np.asarray(point_y)[:, None]
+        inside = ((left < px) & (px < left + self.width[targets]) &
+                  (top < py) & (py < top + self.height[targets]))
+        point_indices = np.flatnonzero(inside.any(axis=1))
+        entity_indices = targets[inside[point_indices].argmax(axis=1)]
+        return point_indices, entity_indices
+
+
+def _column(name, convert=float):
+    """
+    Returns a property reading and writing one EntityStore array at the slot of a view.
+
+    Args:
+        name (str): Name of the array.
+        convert (type): Type values are read back as.
+
+    Returns:
+        property: The property.
+    """
+    def get(self):
+        return convert(getattr(self.store, name)[self.index])
+
+    def set_(self, value):
+        getattr(self.store, name)[self.index] = value
+
+    return property(get, set_)
+
+
+class EnemyView(Enemy):
+    # The fields the batch updates read and write live in the store, the rest stay in Enemy's slots
+    __slots__ = ("store", "index")
+    x = _column("x")
+    y = _column("y")
+    prev_x = _column("prev_x")
+    prev_y = _column("prev_y")
+    width = _column("width")
+    height = _column("height")
+    speed = _column("speed")
+    moves = _column("moves", int)
+    next_shot_tick = _column("next_shot_tick", int)
+
+    def __init__(self, store, index, state):
+        """
+        Initializes an enemy whose position, size, progress along its path and shot schedule live in an EntityStore.
+
+        The view belongs to its slot, which is handed to a new enemy once this one is destroyed, so it must not
+        be kept past the tick the enemy dies in.
+
+        Args:
+            store (EntityStore): Store with the columns of StoredEntities.enemies.
+            index (int): Slot index of the enemy.
+            state (tuple): State of the enemy as returned by Enemy.get_state.
+        """
+        self.store = store
+        self.index = index
+        super().__init__(state[0], state[2], state[3], state[8], state[9], state[1])
+        self.set_state(state)
+
+    @property
+    def is_alive(self):
+        return bool(self.store.alive[self.index])
+
+    @is_alive.setter
+    def is_alive(self, alive):
+        if not alive:
+            self.store.kill(self.index)
+
+    def set_state(self, state):
+        """
+        Overwrites the complete state of the enemy.
+
+        Args:
+            state (tuple): A state as returned by get_state.
+        """
+        super().set_state(state)
+        self.store.segment_end[self.index] = 0  # The next batch move looks the path up again
+
+
+class ProjectileView(Projectile):
+    # Height stays an attribute; the store's height column is the length, the extent collisions and culling use
+    __slots__ = ("store", "index")
+    x = _column("x")
+    y = _column("y")
+    prev_x = _column("prev_x")
+    prev_y = _column("prev_y")
+    width = _column("width")
+    length = _column("height")
+    age = _column("age", int)
+
+    def __init__(self, store, index, x, y, width, height, speed, length, direction):
+        """
+        Initializes a projectile whose position, size and age live in an EntityStore.
+
+        Args:
+            store (EntityStore): Store with an age column.
+            index (int): Slot index of the projectile.
+            x (int): Initial x-coordinate.
+            y (int): Initial y-coordinate.
+            width (int): Width of the projectile.
+            height (int): Height of the projectile.
+            speed (int): Speed of the projectile.
+            length (int): Length of the projectile.
+            direction (str): Direction of the projectile ("up" or "down").
+        """
+        self.store = store
+        self.index = index
+        super().__init__(x, y, width, height, speed, length, direction)
+
+    def reset(self, x, y, width, height, speed, length, direction):
+        """
+        Reinitializes the projectile so its slot can be reused.
+
+        Args:
+            x (int): Initial x-coordinate.
+            y (int): Initial y-coordinate.
+            width (int): Width of the projectile.
+            height (int): Height of the projectile.
+            speed (int): Speed of the projectile.
+            length (int): Length of the projectile.
+            direction (str): Direction of the projectile ("up" or "down").
+        """
+        super().reset(x, y, width, height, speed, length, direction)
+        self.store.vx[self.index] = 0
+        self.store.vy[self.index] = -speed if direction == "up" else speed if direction == "down" else 0
+
+
+class StoredProjectilePool:
+    def __init__(self, max_live=256, max_age=180):
+        """
+        Initializes a drop-in ProjectilePool whose projectiles are ProjectileViews over two EntityStores.
+
+        Upward projectiles, the players', and downward ones, the enemies', go to separate stores so each side
+        can be moved, culled and hit-tested as one batch. Every slot keeps its view, so views are only created
+        while a store grows.
+
+        Args:
+            max_live (int): Maximum number of projectiles that may be live at once.
+            max_age (int): Number of moves after which a projectile is culled even if still on screen.
+        """
+        self.max_live = max_live
+        self.max_age = max_age
+        self.live_count = 0
+        self.player_projectiles = EntityStore(256, columns=("age",))
+        self.enemy_projectiles = EntityStore(256, columns=("age",))
+        self.__views = {self.player_projectiles: [], self.enemy_projectiles: []}
+        self.__created = 0
+        self.__reused = 0
+        self.__released = 0
+        self.__rejected = 0
+        self.__peak_live = 0
+
+    def acquire(self, x, y, width, height, speed, length, direction):
+        """
+        Returns a projectile in a free slot of the store for its direction.
+
+        Args:
+            x (int): Initial x-coordinate.
+            y (int): Initial y-coordinate.
+            width (int): Width of the projectile.
+            height (int): Height of the projectile.
+            speed (int): Speed of the projectile.
+            length (int): Length of the projectile.
+            direction (str): Direction of the projectile ("up" or "down").
+
+        Returns:
+            ProjectileView: A ready-to-use projectile, or None if the live cap has been reached.
+        """
+        if self.live_count >= self.max_live:
+            self.__rejected += 1
+            return None
+
+        store = self.player_projectiles if direction == "up" else self.enemy_projectiles
+        index = store.spawn(x, y, width, length)
+        views = self.__views[store]
+        if index < len(views):
+            projectile = views[index]
+            projectile.reset(x, y, width, height, speed, length, direction)
+            self.__reused += 1
+        else:
+            projectile = ProjectileView(store, index, x, y, width, height, speed, length, direction)
+            views.append(projectile)
+            self.__created += 1
+
+        self.live_count += 1
+        if self.live_count > self.__peak_live:
+            self.__peak_live = self.live_count
+        return projectile
+
+    def release(self, projectile):
+        """
+        Frees the slot of a projectile so it can be reused.
+
+        Args:
+            projectile (ProjectileView): The projectile that is no longer live.
+        """
+        projectile.store.kill(projectile.index)
+        self.live_count -= 1
+        self.__released += 1
+
+    def release_all(self, projectiles):
+        """
+        Releases every projectile in the list and empties it.
+
+        Args:
+            projectiles (list): Live projectiles to return to the pool.
+        """
+        for projectile in projectiles:
+            self.release(projectile)
+        projectiles.clear()
+
+    def cull_all(self, screen_width, screen_height):
+        """
+        Releases every projectile of both stores that left the screen or outlived max_age.
+
+        Args:
+            screen_width (int): Width of the screen.
+            screen_height (int): Height of the screen.
+        """
+        for store in (self.player_projectiles, self.enemy_projectiles):
+            n = store.count
+            indices = np.flatnonzero(store.off_screen(screen_width, screen_height) |
+                                     (store.alive[:n] & (store.age[:n] > self.max_age)))
+            store.kill_many(indices)
+            self.live_count -= len(indices)
+            self.__released += len(indices)
+
+    def views(self, store, indices):
+        """
+        Returns the projectiles in some slots of a store.
+
+        Args:
+            store (EntityStore): player_projectiles or enemy_projectiles.
+            indices (numpy.ndarray): Slot indices.
+
+        Returns:
+            list: ProjectileViews in the order of indices.
+        """
+        views = self.__views[store]
+        return [views[index] for index in indices.tolist()]
+
+    def get_stats(self):
+        """
+        Returns pool statistics.
+
+        Returns:
+            dict: Live, free, created, reused, released, rejected and peak live counts.
+        """
+        return {
+            "live": self.live_count,
+            "free": sum(len(views) - len(store) for store, views in self.__views.items()),
+            "created": self.__created,
+            "reused": self.__reused,
+            "released": self.__released,
+            "rejected": self.__rejected,
+            "peak_live": self.__peak_live,
+        }
+
+
+def _sweep_bounds(store, indices):
+    """
+    Returns the boxes some entities covered over the current tick, like collision.sweep_bounds.
+
+    Args:
+        store (EntityStore): Store of the entities, whose height is their vertical extent.
+        indices (numpy.ndarray): Slot indices of the entities.
+
+    Returns:
+        tuple: (left, top, right, bottom) arrays.
+    """
+    x = store.x[indices]
+    prev_x = store.prev_x[indices]
+    forward = prev_x < x
+    left = np.where(forward, prev_x, x)
+    right = left + (store.width[indices] + np.where(forward, x - prev_x, prev_x - x))
+    y = store.y[indices]
+    prev_y = store.prev_y[indices]
+    downward = prev_y < y
+    top = np.where(downward, prev_y, y)
+    bottom = top + (store.height[indices] + np.where(downward, y - prev_y, prev_y - y))
+    return left, top, right, bottom
+
+
+def _overlapping_pairs(boxes, other_boxes):
+    """
+    Finds every pair of boxes, one from each group, that overlap by more than an edge.
+
+    Args:
+        boxes (tuple): (left, top, right, bottom) arrays of the first group.
+        other_boxes (tuple): (left, top, right, bottom) arrays of the second group.
+
+    Returns:
+        tuple: (positions, other_positions) arrays of the overlapping pairs.
+    """
+    left, top, right, bottom = boxes
+    other_left, other_top, other_right, other_bottom = other_boxes
+    if len(left) == 0 or len(other_left) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+
+    # Sweep along x: a box of the second group can only overlap if its left edge lies between the first box's
+    # left edge minus the widest second box and its right edge. A pixel of slack keeps rounding from dropping
+    # a pair; the exact test below removes the extras.
+    order = np.argsort(other_left, kind="stable")
+    sorted_left = other_left[order]
+    start = np.searchsorted(sorted_left, left - (other_right - other_left).max() - 1)
+    counts = np.maximum(np.searchsorted(sorted_left, right) - start, 0)
+    positions = np.repeat(np.arange(len(left)), counts)
+    offsets = np.arange(len(positions)) - np.repeat(np.cumsum(counts) - counts, counts)
+    other_positions = order[np.repeat(start, counts) + offsets]
+    overlap = ((other_left[other_positions] < right[positions]) & (left[positions] < other_right[other_positions]) &
+               (other_top[other_positions] < bottom[positions]) & (top[positions] < other_bottom[other_positions]))
+    return positions[overlap], other_positions[overlap]
+
+
+def _sweep_axis(start, size, delta, other_start, other_size):
+    """
+    Returns when moving intervals enter and leave static ones along one axis, like collision.swept_aabb.
+
+    Args:
+        start (numpy.ndarray): Start of each moving interval at the start of the tick.
+        size (numpy.ndarray): Size of each moving interval.
+        delta (numpy.ndarray): Displacement of each moving interval over the tick.
+        other_start (numpy.ndarray): Start of each static interval.
+        other_size (numpy.ndarray): Size of each static interval.
+
+    Returns:
+        tuple: (enter, exit, possible) arrays, where possible is False for pairs that can never overlap.
+    """
+    moving = delta != 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = (other_start - start - size) / delta
+        second = (other_start + other_size - start) / delta
+    enter = np.where(moving, np.minimum(first, second), -np.inf)
+    exit_ = np.where(moving, np.maximum(first, second), np.inf)
+    return enter, exit_, moving | ((start < other_start + other_size) & (other_start < start + size))
+
+
+def _hit_times(movers, mover_indices, targets, target_indices):
+    """
+    Finds when each mover first overlaps its paired target during the current tick, like projectile_hit_time.
+
+    Args:
+        movers (EntityStore): Store of the moving entities, e.g. projectiles.
+        mover_indices (numpy.ndarray): Slot indices of the movers, one per pair.
+        targets (EntityStore): Store of the targets.
+        target_indices (numpy.ndarray): Slot indices of the targets, one per pair.
+
+    Returns:
+        numpy.ndarray: Fraction of the tick at which each pair starts to overlap, NaN for pairs that do not.
+    """
+    start_x = movers.prev_x[mover_indices]
+    start_y = movers.prev_y[mover_indices]
+    other_x = targets.prev_x[target_indices]
+    other_y = targets.prev_y[target_indices]
+    # Displacements relative to the target, so the target can be treated as static
+    delta_x = (movers.x[mover_indices] - start_x) - (targets.x[target_indices] - other_x)
+    delta_y = (movers.y[mover_indices] - start_y) - (targets.y[target_indices] - other_y)
+    enter_x, exit_x, possible_x = _sweep_axis(start_x, movers.width[mover_indices], delta_x, other_x,
+                                              targets.width[target_indices])
+    enter_y, exit_y, possible_y = _sweep_axis(start_y, movers.height[mover_indices], delta_y, other_y,
+                                              targets.height[target_indices])
+    enter = np.maximum(enter_x, enter_y)
+    exit_ = np.minimum(exit_x, exit_y)
+    hit = possible_x & possible_y & (enter < exit_) & (enter < 1) & (exit_ > 0)
+    return np.where(hit, np.where(enter > 0, enter, 0.0), np.nan)
+
+
+class StoredEntities:
+    def __init__(self, max_live=256, max_age=180):
+        """
+        Initializes the entities of a Simulation created with entity_store=True.
+
+        Enemies and the projectiles of both sides live in EntityStores, and movement, culling and the hit tests
+        run as one batch per kind and tick. EnemyViews and ProjectileViews stand in for the Enemy and Projectile
+        objects everywhere else, in spawn order, so both paths play the same game.
+
+        Args:
+            max_live (int): Maximum number of projectiles that may be live at once.
+            max_age (int): Number of moves after which a projectile is culled even if still on screen.
+        """
+        # Enemies move along the same path segments as Enemy.move, kept here so only a turn needs Python
+        self.enemies = EntityStore(64, columns=("speed", "moves", "segment_start", "segment_end", "segment_x",
+                                                "next_shot_tick"))
+        self.pool = StoredProjectilePool(max_live, max_age)
+        self.__enemy_views = []
+
+    def enemy_list(self):
+        """
+        Returns the live enemies in spawn order.
+
+        Returns:
+            list: EnemyViews.
+        """
+        views = self.__enemy_views
+        return [views[index] for index in self.enemies.ordered_indices().tolist()]
+
+    def projectile_list(self, store):
+        """
+        Returns the live projectiles of one side in spawn order.
+
+        Args:
+            store (EntityStore): pool.player_projectiles or pool.enemy_projectiles.
+
+        Returns:
+            list: ProjectileViews.
+        """
+        return self.pool.views(store, store.ordered_indices())
+
+    def add_enemies(self, enemies):
+        """
+        Adds copies of enemies to the store, after every live one.
+
+        Args:
+            enemies (list): Enemy objects or views.
+        """
+        self.__add_states([enemy.get_state() for enemy in enemies])
+
+    def set_enemies(self, enemies):
+        """
+        Replaces every enemy with copies of the given ones.
+
+        Args:
+            enemies (list): Enemy objects or views, possibly of the enemies being replaced.
+        """
+        states = [enemy.get_state() for enemy in enemies]
+        self.enemies.kill_many(self.enemies.active_indices())
+        self.__add_states(states)
+
+    def __add_states(self, states):
+        views = self.__enemy_views
+        for state in states:
+            index = self.enemies.spawn(state[2], state[3], state[6], state[7])
+            view = EnemyView(self.enemies, index, state)
+            if index < len(views):
+                views[index] = view
+            else:
+                views.append(view)
+
+    def set_projectiles(self, store, projectiles):
+        """
+        Replaces every projectile of one side with copies of the given ones.
+
+        Args:
+            store (EntityStore): pool.player_projectiles or pool.enemy_projectiles.
+            projectiles (list): Projectile objects or views, possibly of the projectiles being replaced.
+
+        Raises:
+            ValueError: If the projectiles do not fit under the pool's live cap.
+        """
+        states = [(projectile.x, projectile.y, projectile.prev_x, projectile.prev_y, projectile.width,
+                   projectile.height, projectile.speed, projectile.length, projectile.direction, projectile.age)
+                  for projectile in projectiles]
+        self.pool.release_all(self.projectile_list(store))
+        for x, y, prev_x, prev_y, width, height, speed, length, direction, age in states:
+            projectile = self.pool.acquire(x, y, width, height, speed, length, direction)
+            if projectile is None:
+                raise ValueError(f"{len(states)} projectiles do not fit under the live cap of {self.pool.max_live}")
+            projectile.prev_x = prev_x
+            projectile.prev_y = prev_y
+            projectile.age = age
+
+    def move_enemies(self, tick, screen_width):
+        """
+        Moves every live enemy one tick along its path, like Enemy.move.
+
+        Args:
+            tick (int): Current simulation tick.
+            screen_width (int): Width of the playing field.
+
+        Returns:
+            list: EnemyViews whose next shot is due this tick, in spawn order.
+        """
+        store = self.enemies
+        n = store.count
+        alive = store.alive[:n]
+        store.prev_x[:n] = store.x[:n]
+        store.prev_y[:n] = store.y[:n]
+        moves = store.moves[:n]
+        moves += alive
+        views = self.__enemy_views
+        for index in np.flatnonzero(alive & (moves >= store.segment_end[:n])).tolist():
+            (store.segment_start[index], store.segment_end[index], store.segment_x[index], store.vx[index],
+             _) = views[index].enter_segment(int(moves[index]), screen_width)
+        np.add(store.segment_x[:n], (moves - store.segment_start[:n]) * store.vx[:n], out=store.x[:n], where=alive)
+        np.maximum(store.y[:n], 0, out=store.y[:n], where=alive)
+
+        due = np.flatnonzero(alive & (store.next_shot_tick[:n] <= tick))
+        return [views[index] for index in due[np.argsort(store.serial[due], kind="stable")].tolist()]
+
+    def move_projectiles(self):
+        """
+        Moves every live projectile of both sides, like Projectile.move.
+        """
+        for store in (self.pool.player_projectiles, self.pool.enemy_projectiles):
+            store.move()
+            store.age[:store.count] += store.alive[:store.count]
+
+    def enemy_hits(self):
+        """
+        Finds the enemies the player projectiles hit this tick, with the rules of Simulation.check_enemy_collisions.
+
+        Projectiles are resolved in spawn order and each takes the first live enemy it reaches during the tick,
+        simultaneous hits going to the enemy spawned first.
+
+        Returns:
+            list: (projectile, enemy) views of every hit, in the order the hits are resolved.
+        """
+        projectiles = self.pool.player_projectiles
+        enemies = self.enemies
+        projectile_indices = projectiles.ordered_indices()
+        enemy_indices = enemies.ordered_indices()
+        if len(projectile_indices) == 0 or len(enemy_indices) == 0:
+            return []
+        positions, enemy_positions = _overlapping_pairs(_sweep_bounds(projectiles, projectile_indices),
+                                                        _sweep_bounds(enemies, enemy_indices))
+        if len(positions) == 0:
+            return []
+        times = _hit_times(projectiles, projectile_indices[positions], enemies, enemy_indices[enemy_positions])
+        hit = ~np.isnan(times)
+        positions = positions[hit]
+        enemy_positions = enemy_positions[hit]
+        order = np.lexsort((enemy_positions, times[hit], positions))
+
+        hits = []
+        destroyed = set()
+        last = -1
+        projectile_views = self.pool.views(projectiles, projectile_indices[positions[order]])
+        enemy_views = self.__enemy_views
+        for position, enemy_position, projectile in zip(positions[order].tolist(), enemy_positions[order].tolist(),
+                                                         projectile_views):
+            if position != last and enemy_position not in destroyed:
+                destroyed.add(enemy_position)
+                last = position
+                hits.append((projectile, enemy_views[enemy_indices[enemy_position]]))
+        return hits
+
+    def enemy_projectiles_near(self, left, top, right, bottom):
+        """
+        Returns the enemy projectiles whose path this tick overlaps a box, the broad phase of the player hit test.
+
+        Args:
+            left (float): Left edge of the box.
+            top (float): Top edge of the box.
+            right (float): Right edge of the box.
+            bottom (float): Bottom edge of the box.
+
+        Returns:
+            list: ProjectileViews in spawn order.
+        """
+        store = self.pool.enemy_projectiles
+        indices = store.ordered_indices()
+        x, y, x_end, y_end = _sweep_bounds(store, indices)
+        return self.pool.views(store, indices[(x < right) & (left < x_end) & (y < bottom) & (top < y_end)])
@@ -0,0 +1,127 @@
+# events.py
+import json
+import logging
+import threading
+from collections import deque
+
+# Gameplay event types
+ENEMY_KILLED = "enemy_killed"
+PLAYER_HIT = "player_hit"
+WAVE_SPAWNED = "wave_spawned"
+GAME_OVER = "game_over"
+
+DEFAULT_LEVELS = {
+    ENEMY_KILLED: logging.DEBUG,
+    PLAYER_HIT: logging.INFO,
+    WAVE_SPAWNED: logging.INFO,
+    GAME_OVER: logging.INFO,
+}
+
+
+class NullEventBus:
+    """Stand-in used when nobody listens, so posting events costs a single call."""
+
+    def post(self, event_type, **fields):
+        return None
+
+
+NULL_EVENT_BUS = NullEventBus()
+
+
+class EventBus:
+    def __init__(self, logger=None, levels=None, sample_every=None, max_queued=10000, flush_interval=0.1):
+        """
+        Initializes an event bus that queues gameplay events and drains them off the game loop.
+
+        Args:
+            logger (logging.Logger): Logger the events are written to as JSON, defaults to "8bit.events".
+            levels (dict): Event type -> logging level, overriding DEFAULT_LEVELS.
+            sample_every (dict): Event type -> N, keeping only every Nth event of that type.
+            max_queued (int): Maximum number of undrained events; the oldest are dropped beyond this.
+            flush_interval (float): Seconds the background thread sleeps between drains.
+        """
+        self.logger = logger if logger is not None else logging.getLogger("8bit.events")
+        self.levels = dict(DEFAULT_LEVELS, **(levels or {}))
+        self.sample_every = dict(sample_every or {})
+        self.flush_interval = flush_interval
+        self.posted = 0
+        self.dropped = 0
+        self.__queue = deque(maxlen=max_queued)  # deque.append is atomic, so posting needs no lock
+        self.__seen = {}
+        self.__subscribers = {}
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def post(self, event_type, **fields):
+        """
+        Queues an event; this is the only part that runs on the game loop.
+
+        Args:
+            event_type (str): One of the event type constants.
+            **fields: Event data, e.g. tick or eid.
+        """
+        every = self.sample_every.get(event_type)
+        if every:
+            seen = self.__seen.get(event_type, 0) + 1
+            self.__seen[event_type] = seen
+            if seen % every:
+                return
+        if len(self.__queue) == self.__queue.maxlen:
+            self.dropped += 1
+        self.__queue.append((event_type, fields))
+        self.posted += 1
+
+    def subscribe(self, event_type, callback):
+        """
+        Registers a callback that receives events of one type when the queue is drained.
+
+        Args:
+            event_type (str): One of the event type constants.
+            callback (callable): Called as callback(event_type, fields) on the draining thread.
+        """
+        self.__subscribers.setdefault(event_type, []).append(callback)
+
+    def drain(self):
+        """
+        Delivers every queued event to the log and the subscribers.
+
+        Returns:
+            int: Number of events delivered.
+        """
+        delivered = 0
+        queued = self.__queue
+        while queued:
+            event_type, fields = queued.popleft()
+            level = self.levels.get(event_type, logging.INFO)
+            if self.logger.isEnabledFor(level):
+                self.logger.log(level, json.dumps(dict(event=event_type, **fields)))
+            for callback in self.__subscribers.get(event_type, ()):
+                callback(event_type, fields)
+            delivered += 1
+        return delivered
+
+    def start(self):
+        """
+        Starts the background thread that drains the queue.
+        """
+        if self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name="event-bus", daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        while not self.__stop.wait(self.flush_interval):
+            self.drain()
+        self.drain()
+
+    def stop(self):
+        """
+        Stops the background thread after delivering the remaining events.
+        """
+        if self.__thread is None:
+            self.drain()
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
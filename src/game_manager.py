@@ -1,230 +1,293 @@
 # game_manager.py
 import pygame
 import sys
-from spaceship import Spaceship
-from enemy import Enemy
-from projectile import Projectile
-import random
+import time
+from text_cache import TextCache
+from renderer import DirtyRectRenderer
+from sprites import SpriteCache
+from simulation import Simulation
+from snapshot import save_state, load_state
+from assets import Assets, init_display
+from controls import Controls
 
-class GameManager:
-    # Class-level variables to track game state
-    player_spaceship = None  # Default value at the class level
-    player_projectiles = []  # Default value at the class level
-    enemy_projectiles = []  # Default value at the class level
-    enemies = []  # Default value at the class level
 
-    def __init__(self, width, height):
+class GameManager:
+    def __init__(self, width, height, simulation=None, dirty_rects=False, profiler=None, vsync=False,
+                 assets=None, controls=None, leaderboard=None):
         """
         Initializes the game manager with the specified width and height.
 
         Args:
             width (int): Width of the game window.
             height (int): Height of the game window.
+            simulation (Simulation): Simulation to render, a new one is created if omitted.
+            dirty_rects (bool): Only erase and push the screen areas that changed instead of the whole screen.
+            profiler (FrameProfiler): Optional profiler whose overlay can be toggled with F3.
+            vsync (bool): Ask for a display synchronized with the monitor's refresh rate.
+            assets (Assets): Loader for fonts and other assets, a new one is created if omitted.
+            controls (Controls): Input layer with the key and gamepad bindings, defaults are used if omitted.
+            leaderboard (Leaderboard): Optional high-score table finished games are saved to and shown from.
         """
-        pygame.init()
-        self.screen = pygame.display.set_mode((width, height))
+        init_display()
+        if vsync:
+            try:
+                # pygame only offers vsync on a SCALED or OPENGL display
+                self.screen = pygame.display.set_mode((width, height), pygame.SCALED, vsync=1)
+            except pygame.error:
+                self.screen = pygame.display.set_mode((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("8bit Game")
         self.white = (255, 255, 255)
         self.black = (0, 0, 0)
         self.red = (255, 0, 0)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.last_player_shot_time = 0
-        self.score = 0  # Initialize score
-        self.reset_game()
+        self.assets = assets if assets is not None else Assets()
+        self.renderer = DirtyRectRenderer(self.screen, self.white, enabled=dirty_rects)
+        self.sprites = SpriteCache()  # Entity surfaces are baked once and drawn with one blits call per layer
+        self.text_cache = TextCache(max_entries=64)  # HUD text is only re-rendered when its value changes
+
+        # Static labels never change, so they are rendered once, when the game first ends
+        self.game_over_text = None
+        self.game_over_rect = None
+        self.restart_text = None
+        self.restart_rect = None
+        self.simulation = simulation if simulation is not None else Simulation(width, height)
+        self.profiler = profiler
+        if profiler is not None:
+            self.simulation.profiler = profiler
+        self.controls = controls if controls is not None else Controls()
+        self.inputs = 0  # INPUT_* flags sampled by sample_inputs for the next update
+        self.player_index = 0  # Player whose lives the HUD shows, e.g. a network client's own player
+        self.checkpoint = None  # Snapshot saved with F5 and restored with F9
+        self.allow_checkpoints = True  # F5/F9 are ignored while this is False
+        self.leaderboard = leaderboard
+        self.capture = None  # FrameCapture that records every presented frame
+        self.player_name = "Player"  # Name finished games are saved under
+        self.__result_saved = False  # Whether the current game over has been saved to the leaderboard
+
+    @property
+    def font(self):
+        """Font of the HUD and the game over screen, loaded with the first text drawn."""
+        return self.assets.font(36)
+
+    @property
+    def player_spaceship(self):
+        return self.simulation.player_spaceship
+
+    @player_spaceship.setter
+    def player_spaceship(self, new_player_spaceship):
+        self.simulation.player_spaceship = new_player_spaceship
+
+    @property
+    def player_projectiles(self):
+        return self.simulation.player_projectiles
+
+    @player_projectiles.setter
+    def player_projectiles(self, new_player_projectiles):
+        self.simulation.player_projectiles = new_player_projectiles
+
+    @property
+    def enemy_projectiles(self):
+        return self.simulation.enemy_projectiles
+
+    @enemy_projectiles.setter
+    def enemy_projectiles(self, new_enemy_projectiles):
+        self.simulation.enemy_projectiles = new_enemy_projectiles
+
+    @property
+    def enemies(self):
+        return self.simulation.enemies
+
+    @enemies.setter
+    def enemies(self, new_enemies):
+        self.simulation.enemies = new_enemies
+
+    @property
+    def score(self):
+        return self.simulation.score
+
+    @score.setter
+    def score(self, new_score):
+        self.simulation.score = new_score
+
+    @property
+    def projectile_pool(self):
+        return self.simulation.projectile_pool
 
     def reset_game(self):
         """
         Resets the game state to the initial configuration.
         """
-        self.player_spaceship = Spaceship(name="Player", x=self.screen.get_width() // 2,
-                                          y=self.screen.get_height() - 60, width=50, height=50)
-        self.player_projectiles = []
-        self.enemy_projectiles = []
-        self.enemies = [Enemy(eid=1, x=60, y=60, speed=-2, shoot_rate=2000)]
-        self.score = 0  # Reset score to 0 on restart
+        self.simulation.reset()
+
+    def save_checkpoint(self):
+        """
+        Captures the current game state so it can be restored instantly later.
+        """
+        self.checkpoint = save_state(self.simulation)
+
+    def restore_checkpoint(self):
+        """
+        Returns the game to the last saved checkpoint.
+
+        Returns:
+            bool: True if a checkpoint was restored, False if none has been saved.
+        """
+        if self.checkpoint is None:
+            return False
+        load_state(self.simulation, self.checkpoint)
+        self.renderer.invalidate()  # Everything may have jumped, so repaint the whole screen
+        return True
 
     def handle_input(self):
         """
-        Handles user input events, such as key presses and window close.
+        Handles pending events and samples the inputs for the next update, for one tick per frame.
+        """
+        self.poll_events()
+        self.sample_inputs()
+
+    def poll_events(self):
+        """
+        Handles window and hotkey events and queues the gameplay ones in the input layer.
         """
+        if not self.controls.gamepads_enabled:
+            self.controls.enable_gamepads()  # Started with the first poll rather than delaying the first frame
+        now = time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler is not None:
+                self.profiler.show_overlay = not self.profiler.show_overlay
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and self.allow_checkpoints:
+                self.save_checkpoint()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and self.allow_checkpoints:
+                self.restore_checkpoint()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.controls.clear()  # Keys released in another window would otherwise stay held
+            else:
+                self.controls.push(event, now)
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
-            self.player_spaceship.move(-5, 0)
-        if keys[pygame.K_RIGHT]:
-            self.player_spaceship.move(5, 0)
-        if keys[pygame.K_SPACE]:
-            self.shoot_projectile()
+    def sample_inputs(self):
+        """
+        Consumes the queued input events for the next update.
+
+        Returns:
+            int: The INPUT_* flags stored in self.inputs, including keys tapped and released since the last tick.
+        """
+        self.inputs = self.controls.take()
+        return self.inputs
 
     def shoot_projectile(self):
         """
         Fires a projectile from the player's spaceship if the cooldown time has passed.
         """
-        current_time = pygame.time.get_ticks()
-        time_since_last_shot = current_time - self.last_player_shot_time
-        if time_since_last_shot > 200:
-            new_projectile = Projectile(x=self.player_spaceship.x + self.player_spaceship.width // 2 - 5,
-                                        y=self.player_spaceship.y,
-                                        width=10,
-                                        height=self.player_spaceship.height,
-                                        speed=10,
-                                        length=self.player_spaceship.height,
-                                        direction="up")
-            self.player_projectiles.append(new_projectile)
-            self.last_player_shot_time = current_time
+        self.simulation.shoot_projectile()
 
     def update_game_state(self):
         """
-        Updates the game state, including moving objects, handling collisions, and updating scores.
+        Advances the simulation by one tick using the inputs sampled by handle_input.
         """
-        for enemy in self.enemies:
-            enemy.move()
-            new_enemy_projectile = enemy.shoot_projectile()
-            if new_enemy_projectile:
-                self.enemy_projectiles.append(new_enemy_projectile)
-
-        # Update projectile positions
-        for projectile in self.player_projectiles + self.enemy_projectiles:
-            projectile.move()
-
-        # Check for collisions and remove enemies immediately
-        self.check_enemy_collisions()
-
-        # Check for collisions with player spaceship
-        self.check_player_collision()
-
-        # Update blinking status of the player spaceship
-        self.player_spaceship.update_blinking()
+        self.simulation.step(self.inputs)
+        if self.leaderboard is not None:
+            game_over = self.simulation.is_game_over
+            if game_over and not self.__result_saved:
+                simulation = self.simulation
+                self.leaderboard.submit(self.player_name, simulation.score, simulation.tick, simulation.seed)
+            self.__result_saved = game_over
 
     def check_enemy_collisions(self):
         """
         Checks for collisions between player projectiles and enemies, updating scores and spawning new enemies.
         """
-        enemies_to_remove = []
-        for projectile in self.player_projectiles:
-            for enemy in self.enemies:
-                if enemy.is_hit_by_player(projectile):
-                    # Handle enemy hit
-                    print(f"Enemy {enemy.eid} hit!")
-                    enemies_to_remove.append(enemy)
-                    self.score += 10  # Increase the score when an enemy is hit
-
-        for enemy in enemies_to_remove:
-            self.enemies.remove(enemy)
-
-            # If the enemy with ID 1 is hit, spawn two new enemies
-            if enemy.eid == 1:
-                self.enemies.extend([Enemy(eid=2, x=100, y=100, speed=-2, shoot_rate=2000),
-                                     Enemy(eid=3, x=700, y=100, speed=-2, shoot_rate=2000)])
-            elif enemy.eid == 2 or enemy.eid == 3:
-                # If enemies with ID 2 and 3 are both destroyed, spawn a new enemy with ID 4
-                if all(e.eid not in [2, 3] for e in self.enemies):
-                    self.enemies.append(Enemy(eid=4, x=50, y=50, speed=-6, shoot_rate=750))
-            elif enemy.eid == 4:
-                # If enemy with ID 4 is destroyed, spawn three new enemies with ID 5, 6, and 7
-                self.enemies.extend([Enemy(eid=5, x=100, y=100, speed=-2, shoot_rate=2000),
-                                     Enemy(eid=6, x=400, y=100, speed=-2, shoot_rate=2000),
-                                     Enemy(eid=7, x=700, y=100, speed=-2, shoot_rate=2000)])
-            elif enemy.eid == 5 or enemy.eid == 6 or enemy.eid == 7:
-                # If enemies with ID 5, 6, and 7 are all destroyed, spawn two new enemies with ID 8 and 9
-                if all(e.eid not in [5, 6, 7] for e in self.enemies):
-                    self.enemies.extend([Enemy(eid=8, x=100, y=100, speed=-4, shoot_rate=750),
-                                         Enemy(eid=9, x=700, y=100, speed=-4, shoot_rate=750)])
-            elif enemy.eid == 8 or enemy.eid == 9:
-                # If enemies with ID 8 and 9 are both destroyed, spawn three new enemies with ID 10, 11, and 12
-                if all(e.eid not in [8, 9] for e in self.enemies):
-                    self.enemies.extend([Enemy(eid=10, x=100, y=100, speed=-6, shoot_rate=1000),
-                                         Enemy(eid=11, x=400, y=100, speed=-4, shoot_rate=750),
-                                         Enemy(eid=12, x=700, y=100, speed=-2, shoot_rate=500)])
-
-        # Check if all enemies are destroyed, then trigger randomization for the next group
-        if not self.enemies:
-            # Determine whether to use random values for the next group
-            if all(e.eid >= 12 for e in enemies_to_remove):
-                # Randomize characteristics for the next group
-                next_group_size = random.randint(1, 4)
-                next_group_start_id = max(e.eid for e in enemies_to_remove) + 1
-
-                next_group = [
-                    Enemy(
-                        eid=i,
-                        x=random.randint(100, 700),
-                        y=random.randint(50, 150),
-                        speed=random.uniform(-3, -6),
-                        shoot_rate=random.randint(500, 1000),
-                    )
-                    for i in range(next_group_start_id, next_group_start_id + next_group_size)
-                ]
-
-                self.enemies.extend(next_group)
+        self.simulation.check_enemy_collisions()
 
     def check_player_collision(self):
         """
         Checks for collisions between enemy projectiles and the player's spaceship, updating lives and hit status.
         """
-        player_spaceship_hit = any(
-            [self.player_spaceship.is_hit_by_enemy(projectile) for projectile in self.enemy_projectiles]
-        )
-        if player_spaceship_hit:
-            print("Player spaceship hit!")
-            self.player_spaceship.reset_hit_status()  # Reset hit status for the next frame
-            self.player_spaceship.decrement_lives()  # Decrement lives when hit
+        self.simulation.check_player_collision()
 
-    def draw_objects(self):
+    def draw_objects(self, alpha=None):
         """
         Draws game objects on the screen, including the player's spaceship, enemies, projectiles, lives, and score.
+
+        Args:
+            alpha (float): Fraction of a tick elapsed since the last update; if given, entities are drawn between
+                their previous and current positions so motion stays smooth when frames and ticks do not line up.
         """
-        self.screen.fill(self.white)
+        renderer = self.renderer
+        renderer.begin_frame()
 
-        if self.player_spaceship.lives > 0:
-            # Draw the player spaceship
-            self.player_spaceship.draw(self.screen)
+        if not self.simulation.is_game_over:
+            # Draw the player spaceships that are still in the game
+            for spaceship in self.simulation.spaceships:
+                if spaceship.lives <= 0:
+                    continue
+                spaceship_color = spaceship.get_color(self.simulation.time_ms)
+                if spaceship_color is not None:
+                    position = (spaceship.x, spaceship.y)
+                    if alpha is not None:
+                        position = (spaceship.prev_x + (spaceship.x - spaceship.prev_x) * alpha,
+                                    spaceship.prev_y + (spaceship.y - spaceship.prev_y) * alpha)
+                    renderer.add(self.screen.blit(self.sprites.get(spaceship.width, spaceship.height,
+                                                                   spaceship_color), position))
 
             # Draw the enemies with the updated color
-            for enemy in self.enemies:
-                pygame.draw.rect(self.screen, enemy.get_color(), (enemy.x, enemy.y, enemy.width, enemy.height))
+            renderer.add_many(self.sprites.draw_rects(self.screen, self.enemies, alpha=alpha))
 
             # Draw projectiles
-            for projectile in self.player_projectiles:
-                pygame.draw.rect(self.screen, (0, 255, 0),
-                                 (projectile.x, projectile.y, projectile.width, projectile.length))
-            for projectile in self.enemy_projectiles:
-                pygame.draw.rect(self.screen, (255, 0, 0),
-                                 (projectile.x, projectile.y, projectile.width, projectile.length))
+            renderer.add_many(self.sprites.draw_rects(self.screen, self.player_projectiles, (0, 255, 0), "length",
+                                                      alpha))
+            renderer.add_many(self.sprites.draw_rects(self.screen, self.enemy_projectiles, (255, 0, 0), "length",
+                                                      alpha))
 
-            # Draw player lives
-            lives_text = self.font.render(f"Lives: {self.player_spaceship.lives}", True, self.black)
-            self.screen.blit(lives_text, (10, 10))  # Adjust the position as needed
+            # Draw the local player's lives
+            lives = self.simulation.spaceships[self.player_index].lives
+            lives_text = self.text_cache.render(self.font, f"Lives: {lives}", self.black)
+            renderer.add(self.screen.blit(lives_text, (10, 10)))  # Adjust the position as needed
 
             # Draw score
-            score_text = self.font.render(f"Score: {self.score}", True, self.black)
-            self.screen.blit(score_text, (120, 10))  # Adjust the position as needed
+            score_text = self.text_cache.render(self.font, f"Score: {self.score}", self.black)
+            renderer.add(self.screen.blit(score_text, (120, 10)))  # Adjust the position as needed
         else:
             # Player has no lives left, display "Game Over" message
-            game_over_text = self.font.render("Game Over", True, self.red)
-            text_rect = game_over_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2))
-            self.screen.blit(game_over_text, text_rect)
+            if self.game_over_text is None:
+                width, height = self.screen.get_size()
+                self.game_over_text = self.font.render("Game Over", True, self.red)
+                self.game_over_rect = self.game_over_text.get_rect(center=(width // 2, height // 2))
+                self.restart_text = self.font.render("Press R to restart", True, self.black)
+                self.restart_rect = self.restart_text.get_rect(center=(width // 2, height // 2 + 70))
+            renderer.add(self.screen.blit(self.game_over_text, self.game_over_rect))
 
             # Display the final score in black
-            final_score_text = self.font.render(f"Final Score: {self.score}", True, self.black)
+            final_score_text = self.text_cache.render(self.font, f"Final Score: {self.score}", self.black)
             final_score_rect = final_score_text.get_rect(
                 center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 30))
-            self.screen.blit(final_score_text, final_score_rect)
+            renderer.add(self.screen.blit(final_score_text, final_score_rect))
 
             # Prompt to restart the game
-            restart_text = self.font.render("Press R to restart", True, self.black)
-            restart_rect = restart_text.get_rect(
-                center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 70))
-            self.screen.blit(restart_text, restart_rect)
+            renderer.add(self.screen.blit(self.restart_text, self.restart_rect))
 
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_r]:
-                self.reset_game()  # Restart the game if the player presses 'R'
+            # High scores as last written by the leaderboard's background thread, so drawing never reads the disk
+            if self.leaderboard is not None:
+                font = self.assets.font(28)
+                center_x = self.screen.get_width() // 2
+                top = self.restart_rect.bottom + 30
+                for rank, (player, score) in enumerate(self.leaderboard.top_scores[:5]):
+                    line = self.text_cache.render(font, f"{rank + 1}. {player}  {score}", self.black)
+                    renderer.add(self.screen.blit(line, line.get_rect(midtop=(center_x, top + rank * 28))))
 
-        pygame.display.flip()
+        if self.profiler is not None and self.profiler.show_overlay:
+            renderer.add_many(self.profiler.draw_overlay(self.screen, self.assets.font(20)))
+
+        renderer.present()
+        if self.capture is not None:
+            self.capture.capture(self.screen)
+
+    def wait_for_next_frame(self):
+        """
+        Sleeps so the game runs at no more than 60 frames per second.
+        """
         self.clock.tick(60)
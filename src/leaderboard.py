@@ -0,0 +1,184 @@
+# leaderboard.py
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+DEFAULT_DATABASE = os.path.join(os.path.expanduser("~"), ".8bit_game", "leaderboard.sqlite3")
+
+logger = logging.getLogger("8bit.leaderboard")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    ticks INTEGER,
+    seed INTEGER,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC, id);
+"""
+
+
+class Leaderboard:
+    def __init__(self, path=DEFAULT_DATABASE, cached_top=10):
+        """
+        Initializes a persistent high-score table in a local SQLite file.
+
+        Results are queued by submit and written by a background thread, so the game loop never waits for the
+        disk. Both queries walk an index in score order and stop after the requested rows, so their cost does
+        not grow with the size of the table.
+
+        Args:
+            path (str): Path of the database file; its directory is created if needed.
+            cached_top (int): Number of best scores the writer keeps in top_scores for drawing.
+        """
+        self.path = path
+        self.cached_top = cached_top
+        self.top_scores = []  # (player, score) of the best results, refreshed by the writer after each write
+        self.written = 0
+        self.__queue = deque()  # Results not yet written; the game loop appends and the writer pops the other end
+        self.__wake = threading.Event()
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__reader = None  # Connection of the thread that runs the queries
+
+    def __connect(self):
+        """
+        Opens a connection and makes sure the schema exists.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers do not wait for the writer and vice versa
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def submit(self, player, score, ticks=None, seed=None):
+        """
+        Hands a game result to the writer thread and returns at once, without touching the database.
+
+        Args:
+            player (str): Name of the player.
+            score (int): Final score.
+            ticks (int): Length of the game in ticks.
+            seed (int): Seed of the game, e.g. to look up its replay.
+        """
+        self.__queue.append((player, score, ticks, seed, time.time()))
+        self.__wake.set()
+
+    def write_pending(self, connection=None):
+        """
+        Writes every queued result in one transaction and refreshes top_scores.
+
+        Args:
+            connection (sqlite3.Connection): Connection to write with, the query connection if omitted.
+
+        Returns:
+            int: Number of results written.
+        """
+        connection = connection if connection is not None else self.__query_connection()
+        rows = []
+        queued = self.__queue
+        while queued:
+            rows.append(queued.popleft())
+        if rows:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO scores (player, score, ticks, seed, recorded_at) VALUES (?, ?, ?, ?, ?)", rows)
+            self.written += len(rows)
+        if rows or not self.top_scores:
+            self.top_scores = self.__top(connection, self.cached_top)
+        return len(rows)
+
+    def start(self):
+        """
+        Starts the background thread that writes the results.
+        """
+        if self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name="leaderboard", daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        connection = self.__connect()
+        try:
+            self.write_pending(connection)  # Loads top_scores for the first game over screen
+            while not self.__stop.is_set():
+                self.__wake.wait()
+                self.__wake.clear()
+                try:
+                    self.write_pending(connection)
+                except sqlite3.Error:
+                    logger.exception("could not save the scores")
+            self.write_pending(connection)  # Results submitted while the last batch was being written
+        finally:
+            connection.close()
+
+    def stop(self):
+        """
+        Stops the background thread after writing the remaining results.
+        """
+        if self.__thread is None:
+            self.write_pending()
+            return
+        self.__stop.set()
+        self.__wake.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def __query_connection(self):
+        if self.__reader is None:
+            self.__reader = self.__connect()
+        return self.__reader
+
+    @staticmethod
+    def __top(connection, limit):
+        return connection.execute("SELECT player, score FROM scores ORDER BY score DESC, id LIMIT ?",
+                                  (limit,)).fetchall()
+
+    def top(self, limit=10):
+        """
+        Returns the best results of all players, earlier results first on equal scores.
+
+        Args:
+            limit (int): Number of results.
+
+        Returns:
+            list: (player, score) tuples, best first.
+        """
+        return self.__top(self.__query_connection(), limit)
+
+    def best_of(self, player, limit=10):
+        """
+        Returns the best results of one player.
+
+        Args:
+            player (str): Name of the player.
+            limit (int): Number of results.
+
+        Returns:
+            list: (score, ticks, seed, recorded_at) tuples, best first.
+        """
+        return self.__query_connection().execute(
+            "SELECT score, ticks, seed, recorded_at FROM scores WHERE player = ? ORDER BY score DESC, id LIMIT ?",
+            (player, limit)).fetchall()
+
+    def close(self):
+        """
+        Writes the remaining results and closes the database.
+        """
+        self.stop()
+        if self.__reader is not None:
+            self.__reader.close()
+            self.__reader = None
@@ -1,17 +1,331 @@
-import pygame
-from game_manager import GameManager
+import argparse
+import logging
+import sys
+import time
 
+PROCESS_START = time.perf_counter()  # Taken before the game modules (and pygame) are imported
 
-def main():
-    pygame.init()
+from simulation import Simulation
+from replay import Replay, ReplayRecorder
+from profiler import FrameProfiler
+from events import EventBus
+from leaderboard import Leaderboard, DEFAULT_DATABASE
 
-    width, height = 800, 600
-    game_manager = GameManager(width, height)
+logger = logging.getLogger("8bit.startup")
 
-    while True:
-        game_manager.handle_input()
-        game_manager.update_game_state()
+MAX_FRAME_SECONDS = 0.25  # Longest frame time the fixed-step loop simulates; anything longer slows the game down
+
+
+def run_windowed(width, height, seed=None, record_path=None, dirty_rects=False, profile=False, trace_path=None,
+                 event_bus=None, interpolate=False, max_fps=0, vsync=False, first_frame_only=False,
+                 bindings_path=None, leaderboard_path=None, player_name="Player", capture_path=None, capture_fps=60,
+                 entity_store=False):
+    """
+    Runs the game in a pygame window.
+
+    By default input, update and draw run in lockstep, one simulation tick per rendered frame at up to
+    60 frames per second. With interpolate, the simulation runs at its fixed tick rate on an accumulator
+    while frames are rendered as fast as allowed, drawing entities between their last two ticks.
+
+    Args:
+        width (int): Width of the game window.
+        height (int): Height of the game window.
+        seed (int): Seed for the simulation, random if omitted.
+        record_path (str): Optional path to record a replay of the session to.
+        dirty_rects (bool): Only push the screen areas that changed each frame.
+        profile (bool): Show the profiling overlay from the start; F3 toggles it either way.
+        trace_path (str): Optional CSV or JSON file the recent frame timings are written to on exit.
+        event_bus (EventBus): Optional bus the simulation posts gameplay events to.
+        interpolate (bool): Decouple rendering from the fixed-rate simulation and interpolate between ticks.
+        max_fps (int): Frame rate cap when interpolating, 0 for uncapped.
+        vsync (bool): Synchronize frames with the monitor's refresh rate.
+        first_frame_only (bool): Exit once the first frame is on screen, to measure startup time.
+        bindings_path (str): Optional JSON file remapping the keys and gamepad buttons, see load_bindings.
+        leaderboard_path (str): Optional SQLite file finished games are saved to and high scores read from.
+        player_name (str): Name finished games are saved under.
+        capture_path (str): Optional image pattern, raw file or video every frame is recorded to, see FrameCapture.
+        capture_fps (int): Frame rate of captured videos.
+        entity_store (bool): Keep the entities in NumPy arrays and update them in batches, see Simulation.
+    """
+    from game_manager import GameManager
+    from capture import FrameCapture
+    from controls import Controls, load_bindings
+
+    profiler = FrameProfiler()
+    profiler.show_overlay = profile
+    simulation = Simulation(width, height, seed=seed, entity_store=entity_store)
+    if event_bus is not None:
+        simulation.events = event_bus
+    controls = Controls(*load_bindings(bindings_path)) if bindings_path else None
+    game_manager = GameManager(width, height, simulation=simulation, dirty_rects=dirty_rects, profiler=profiler,
+                               vsync=vsync, controls=controls)
+    if leaderboard_path:
+        game_manager.leaderboard = Leaderboard(leaderboard_path)
+        game_manager.leaderboard.start()
+        game_manager.player_name = player_name
+    if capture_path:
+        game_manager.capture = FrameCapture(capture_path, game_manager.screen, fps=capture_fps)
+    recorder = ReplayRecorder(record_path, game_manager.simulation) if record_path else None
+    game_manager.allow_checkpoints = recorder is None  # A restored checkpoint would break the recorded replay
+
+    try:
         game_manager.draw_objects()
+        logger.info("first frame after %.1f ms (%.1f ms loading assets)",
+                    (time.perf_counter() - PROCESS_START) * 1000, game_manager.assets.load_seconds * 1000)
+        if first_frame_only:
+            return
+        if interpolate:
+            _run_fixed_step(game_manager, profiler, recorder, max_fps)
+        else:
+            _run_lockstep(game_manager, profiler, recorder)
+    finally:
+        if recorder:
+            recorder.close()
+        if game_manager.leaderboard is not None:
+            game_manager.leaderboard.close()  # Writes the results still queued
+        if game_manager.capture is not None:
+            game_manager.capture.close()
+        if trace_path:
+            profiler.export(trace_path)
+
+
+def _run_lockstep(game_manager, profiler, recorder):
+    """
+    Runs one simulation tick per rendered frame, so the game slows down with the frame rate.
+
+    Args:
+        game_manager (GameManager): The game to run.
+        profiler (FrameProfiler): Profiler timing each frame.
+        recorder (ReplayRecorder): Optional recorder receiving the inputs of every tick.
+    """
+    while True:
+        profiler.begin_frame()
+        with profiler.phase("handle_input"):
+            game_manager.handle_input()
+        if recorder:
+            recorder.record(game_manager.inputs)
+        with profiler.phase("update_game_state"):
+            game_manager.update_game_state()
+        with profiler.phase("draw_objects"):
+            game_manager.draw_objects()
+        profiler.end_frame(game_manager.simulation.get_entity_counts())
+        game_manager.wait_for_next_frame()
+
+
+def _run_fixed_step(game_manager, profiler, recorder, max_fps):
+    """
+    Runs the simulation at its fixed tick rate and renders as often as max_fps allows, interpolating
+    entity positions between the last two ticks.
+
+    Args:
+        game_manager (GameManager): The game to run.
+        profiler (FrameProfiler): Profiler timing each frame.
+        recorder (ReplayRecorder): Optional recorder receiving the inputs of every tick.
+        max_fps (int): Frame rate cap, 0 for uncapped.
+    """
+    simulation = game_manager.simulation
+    tick_seconds = 1 / simulation.tick_rate
+    accumulator = 0.0
+    previous = time.perf_counter()
+    while True:
+        profiler.begin_frame()
+        now = time.perf_counter()
+        # A long stall (window drag, breakpoint) is not caught up in one burst of ticks
+        accumulator += min(now - previous, MAX_FRAME_SECONDS)
+        previous = now
+
+        with profiler.phase("handle_input"):
+            game_manager.poll_events()
+        with profiler.phase("update_game_state"):
+            while accumulator >= tick_seconds:
+                # Each tick consumes its own inputs, so a tap lands on exactly one tick even when a frame runs
+                # several ticks or none at all
+                game_manager.sample_inputs()
+                if recorder:
+                    recorder.record(game_manager.inputs)
+                game_manager.update_game_state()
+                accumulator -= tick_seconds
+        with profiler.phase("draw_objects"):
+            game_manager.draw_objects(alpha=accumulator / tick_seconds)
+        profiler.end_frame(simulation.get_entity_counts())
+        game_manager.clock.tick(max_fps)
+
+
+def run_headless(width, height, ticks, seed=None, event_bus=None, entity_store=False):
+    """
+    Runs the simulation without a display as fast as possible.
+
+    Args:
+        width (int): Width of the playing field.
+        height (int): Height of the playing field.
+        ticks (int): Number of ticks to simulate.
+        seed (int): Seed for the simulation, random if omitted.
+        event_bus (EventBus): Optional bus the simulation posts gameplay events to.
+        entity_store (bool): Keep the entities in NumPy arrays and update them in batches, see Simulation.
+
+    Returns:
+        Simulation: The simulation after the last tick.
+    """
+    simulation = Simulation(width, height, seed=seed, entity_store=entity_store)
+    if event_bus is not None:
+        simulation.events = event_bus
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.step()
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {ticks} ticks in {elapsed:.3f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s), "
+          f"score {simulation.score}, lives {simulation.player_spaceship.lives}")
+    return simulation
+
+
+def run_server(width, height, players, port, seed=None):
+    """
+    Hosts a multiplayer match on localhost until interrupted.
+
+    Args:
+        width (int): Width of the playing field.
+        height (int): Height of the playing field.
+        players (int): Number of players; the match starts once all of them are connected.
+        port (int): TCP port to listen on.
+        seed (int): Seed for the simulation, random if omitted.
+    """
+    import asyncio
+    from server import GameServer
+
+    server = GameServer(width, height, players=players, seed=seed, port=port)
+
+    async def serve():
+        try:
+            await server.run()
+        finally:
+            await server.close()
+
+    asyncio.run(serve())
+
+
+def run_client(address, dirty_rects=False, bindings_path=None):
+    """
+    Joins a multiplayer match and renders the server's state with the regular drawing code.
+
+    Args:
+        address (str): HOST:PORT of the server.
+        dirty_rects (bool): Only push the screen areas that changed each frame.
+        bindings_path (str): Optional JSON file remapping the keys and gamepad buttons, see load_bindings.
+    """
+    import pygame
+    from game_manager import GameManager
+    from client import GameClient
+    from controls import Controls, load_bindings
+
+    host, _, port = address.rpartition(":")
+    client = GameClient(host or "127.0.0.1", int(port))
+    simulation = client.simulation
+    controls = Controls(*load_bindings(bindings_path)) if bindings_path else None
+    game_manager = GameManager(simulation.width, simulation.height, simulation=simulation, dirty_rects=dirty_rects,
+                               controls=controls)
+    game_manager.player_index = client.player
+    game_manager.allow_checkpoints = False  # The server owns the game state
+    pygame.display.set_caption(f"8bit Game - player {client.player + 1}")
+    try:
+        while True:
+            game_manager.handle_input()
+            client.send_inputs(game_manager.inputs)
+            client.poll()
+            game_manager.draw_objects()
+            game_manager.wait_for_next_frame()
+    finally:
+        client.close()
+
+
+def run_replay(path):
+    """
+    Plays a recorded replay headless at maximum speed and checks it against its recorded result.
+
+    Args:
+        path (str): Path of the replay file.
+
+    Returns:
+        bool: True if the replay reproduced the recorded score.
+    """
+    replay = Replay(path)
+    start = time.perf_counter()
+    simulation = replay.play()
+    elapsed = time.perf_counter() - start
+    verified = simulation.tick == replay.ticks and simulation.score == replay.final_score
+    print(f"Replayed {simulation.tick} ticks in {elapsed:.3f}s, score {simulation.score} "
+          f"(recorded {replay.final_score}): {'verified' if verified else 'MISMATCH'}")
+    return verified
+
+
+def main():
+    parser = argparse.ArgumentParser(description="8bit Game")
+    parser.add_argument("--headless", action="store_true", help="run the simulation without a window")
+    parser.add_argument("--ticks", type=int, default=60 * 60, help="number of ticks to simulate when headless")
+    parser.add_argument("--seed", type=int, help="seed for the game's random generator")
+    parser.add_argument("--record", metavar="PATH", help="record a replay of the session to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="play back and verify the replay at PATH headless")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only redraw the screen areas that changed, for software-rendered displays")
+    parser.add_argument("--interpolate", action="store_true",
+                        help="run the simulation at a fixed rate and render uncapped, interpolating between ticks")
+    parser.add_argument("--max-fps", type=int, default=0, help="frame rate cap with --interpolate (0: uncapped)")
+    parser.add_argument("--vsync", action="store_true", help="synchronize frames with the display refresh rate")
+    parser.add_argument("--first-frame", action="store_true",
+                        help="exit once the first frame is drawn, logging the time it took to get there")
+    parser.add_argument("--bindings", metavar="PATH",
+                        help="JSON file remapping keys and gamepad buttons, e.g. {\"keys\": {\"a\": \"left\"}}")
+    parser.add_argument("--leaderboard", metavar="PATH", default=DEFAULT_DATABASE,
+                        help="SQLite file high scores are kept in (default: %(default)s)")
+    parser.add_argument("--no-leaderboard", action="store_true", help="do not save or show high scores")
+    parser.add_argument("--name", default="Player", help="name high scores are saved under")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="record every frame to PATH: an image pattern like frames/%%06d.png, a raw .rgb "
+                             "stream or a video encoded with ffmpeg, e.g. session.mp4")
+    parser.add_argument("--capture-fps", type=int, default=60,
+                        help="frame rate of captured videos; match it with --max-fps when interpolating")
+    parser.add_argument("--profile", action="store_true", help="show the profiling overlay (toggle with F3)")
+    parser.add_argument("--trace", metavar="PATH", help="write recent frame timings to PATH (.csv or .json) on exit")
+    parser.add_argument("--entity-store", action="store_true",
+                        help="keep enemies and projectiles in NumPy arrays and update them in batches")
+    parser.add_argument("--bullet-hell", action="store_true",
+                        help="play the bullet-hell stress mode (see bullet_hell.py for the frame-time check)")
+    parser.add_argument("--serve", action="store_true", help="host a multiplayer match on localhost")
+    parser.add_argument("--players", type=int, default=2, help="number of players in a hosted match")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port of a hosted match")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="join a multiplayer match")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="minimum level of gameplay events to log (enemy kills are DEBUG)")
+    parser.add_argument("--event-log", metavar="PATH", help="write gameplay events to PATH instead of stderr")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, filename=args.event_log,
+                        format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    event_bus = EventBus()
+    event_bus.start()
+
+    width, height = 800, 600
+    try:
+        if args.replay:
+            sys.exit(0 if run_replay(args.replay) else 1)
+        elif args.bullet_hell:
+            from bullet_hell import run_windowed as run_bullet_hell
+            run_bullet_hell(seed=args.seed)
+        elif args.serve:
+            run_server(width, height, args.players, args.port, seed=args.seed)
+        elif args.connect:
+            run_client(args.connect, dirty_rects=args.dirty_rects, bindings_path=args.bindings)
+        elif args.headless:
+            run_headless(width, height, args.ticks, seed=args.seed, event_bus=event_bus,
+                         entity_store=args.entity_store)
+        else:
+            run_windowed(width, height, seed=args.seed, record_path=args.record, dirty_rects=args.dirty_rects,
+                         profile=args.profile, trace_path=args.trace, event_bus=event_bus,
+                         interpolate=args.interpolate, max_fps=args.max_fps, vsync=args.vsync,
+                         first_frame_only=args.first_frame, bindings_path=args.bindings,
+                         leaderboard_path=None if args.no_leaderboard else args.leaderboard, player_name=args.name,
+                         capture_path=args.capture, capture_fps=args.capture_fps, entity_store=args.entity_store)
+    finally:
+        event_bus.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+# netsync.py
+from enemy import Enemy
+from projectile import Projectile
+from spaceship import Spaceship
+
+# Entity kinds in state messages
+KIND_SPACESHIP = "s"
+KIND_ENEMY = "e"
+KIND_PLAYER_PROJECTILE = "p"
+KIND_ENEMY_PROJECTILE = "q"
+
+
+def _projectile_fields(kind, projectile, tick):
+    """
+    Describes a projectile by its launch point and velocity, which stay fixed for its whole flight.
+
+    Args:
+        kind (str): KIND_PLAYER_PROJECTILE or KIND_ENEMY_PROJECTILE.
+        projectile (Projectile): The projectile.
+        tick (int): Current simulation tick.
+
+    Returns:
+        tuple: (kind, x, launch y, launch tick, vertical speed per tick, width, length)
+    """
+    velocity = -projectile.speed if projectile.direction == "up" else projectile.speed
+    return (kind, round(projectile.x), round(projectile.y - velocity * projectile.age), tick - projectile.age,
+            velocity, projectile.width, projectile.length)
+
+
+class DeltaEncoder:
+    def __init__(self):
+        """
+        Initializes an encoder that turns simulation states into delta-compressed state messages.
+
+        Each message only carries the entities that were added or changed since the previous one, plus the ids
+        of those that disappeared. Projectiles are sent once, as a launch point and velocity the receiver
+        extrapolates, so their cost does not grow with the number of ticks they fly.
+        """
+        self.__net_ids = {}  # id(entity) -> network id
+        self.__sent = {}  # Network id -> fields last sent
+        self.__next_id = 1
+        self.tick = 0
+
+    def __net_id(self, entity):
+        net_id = self.__net_ids.get(id(entity))
+        if net_id is None:
+            net_id = self.__next_id
+            self.__next_id += 1
+            self.__net_ids[id(entity)] = net_id
+        return net_id
+
+    def encode(self, simulation):
+        """
+        Builds the state message for the simulation's current tick and makes it the new baseline.
+
+        Args:
+            simulation (Simulation): The authoritative simulation.
+
+        Returns:
+            dict: State message with tick, time, score and wave, the changed entities under "set" as
+            [network id, kind, fields...] lists, and the removed network ids under "del".
+        """
+        tick = simulation.tick
+        current = {}
+        entities = {}
+        for player, spaceship in enumerate(simulation.spaceships):
+            net_id = self.__net_id(spaceship)
+            entities[net_id] = spaceship
+            current[net_id] = (KIND_SPACESHIP, player, round(spaceship.x), round(spaceship.y), spaceship.lives)
+        for enemy in simulation.enemies:
+            net_id = self.__net_id(enemy)
+            entities[net_id] = enemy
+            current[net_id] = (KIND_ENEMY, round(enemy.x), round(enemy.y), enemy.width, enemy.height)
+        for kind, projectiles in ((KIND_PLAYER_PROJECTILE, simulation.player_projectiles),
+                                  (KIND_ENEMY_PROJECTILE, simulation.enemy_projectiles)):
+            for projectile in projectiles:
+                net_id = self.__net_id(projectile)
+                entities[net_id] = projectile
+                current[net_id] = _projectile_fields(kind, projectile, tick)
+
+        sent = self.__sent
+        changed = [[net_id, *fields] for net_id, fields in current.items() if sent.get(net_id) != fields]
+        removed = [net_id for net_id in sent if net_id not in current]
+        if removed:
+            # Forget the ids of entities that are gone; their objects may be reused or freed
+            live_ids = {id(entity) for entity in entities.values()}
+            self.__net_ids = {key: net_id for key, net_id in self.__net_ids.items() if key in live_ids}
+        self.__sent = current
+        self.tick = tick
+        return self.__message(simulation, changed, removed)
+
+    def full_state(self, simulation):
+        """
+        Builds a message holding the whole baseline, for a receiver that joins between deltas.
+
+        Args:
+            simulation (Simulation): The simulation last passed to encode.
+
+        Returns:
+            dict: State message flagged "full", after which the receiver can apply the following deltas.
+        """
+        message = self.__message(simulation, [[net_id, *fields] for net_id, fields in self.__sent.items()], [])
+        message["full"] = True
+        return message
+
+    def __message(self, simulation, changed, removed):
+        return {"type": "state", "tick": self.tick, "time": simulation.time_ms, "score": simulation.score,
+                "wave": simulation.waves.wave, "set": changed, "del": removed}
+
+
+class DeltaDecoder:
+    def __init__(self, simulation):
+        """
+        Initializes a decoder that mirrors a remote simulation into a local one for drawing.
+
+        The local simulation is never stepped; its entity lists are rebuilt from the state messages so the
+        regular GameManager drawing code can render it.
+
+        Args:
+            simulation (Simulation): Local simulation to fill, with the same player count as the remote one.
+        """
+        self.simulation = simulation
+        self.__entities = {}  # Network id -> (kind, entity, fields)
+        self.synchronized = False  # Set once a full state has been received
+
+    def apply(self, message):
+        """
+        Applies a state message to the local simulation.
+
+        Args:
+            message (dict): A message from DeltaEncoder.encode or DeltaEncoder.full_state.
+        """
+        entities = self.__entities
+        if message.get("full"):
+            entities.clear()
+            self.synchronized = True
+        elif not self.synchronized:
+            return  # Deltas are meaningless without the baseline they build on
+
+        simulation = self.simulation
+        simulation.tick = tick = message["tick"]
+        simulation.time_ms = message["time"]
+        simulation.score = message["score"]
+        for net_id in message["del"]:
+            entities.pop(net_id, None)
+        for net_id, kind, *fields in message["set"]:
+            known = entities.get(net_id)
+            if kind == KIND_SPACESHIP:
+                player, x, y, lives = fields
+                spaceship = known[1] if known is not None and known[0] == kind else None
+                if spaceship is None:
+                    spaceship = Spaceship(name=f"Player {player + 1}", x=x, y=y, width=50, height=50)
+                elif lives < spaceship.lives:
+                    spaceship.start_blinking(simulation.time_ms)
+                spaceship.x = spaceship.prev_x = x
+                spaceship.y = spaceship.prev_y = y
+                spaceship.lives = lives
+                entities[net_id] = (kind, spaceship, fields)
+            elif kind == KIND_ENEMY:
+                x, y, width, height = fields
+                enemy = known[1] if known is not None and known[0] == kind else Enemy(net_id, x, y, 0, 0)
+                enemy.prev_x, enemy.prev_y = enemy.x, enemy.y
+                enemy.x, enemy.y, enemy.width, enemy.height = x, y, width, height
+                entities[net_id] = (kind, enemy, fields)
+            else:
+                x, launch_y, launch_tick, velocity, width, length = fields
+                projectile = Projectile(x, launch_y, width, length, abs(velocity), length,
+                                        "up" if velocity < 0 else "down")
+                entities[net_id] = (kind, projectile, fields)
+
+        spaceships = list(simulation.spaceships)
+        enemies = []
+        player_projectiles = []
+        enemy_projectiles = []
+        for kind, entity, fields in entities.values():
+            if kind == KIND_SPACESHIP:
+                spaceships[fields[0]] = entity
+            elif kind == KIND_ENEMY:
+                enemies.append(entity)
+            else:
+                # Projectiles fly in a straight line, so their position follows from the launch point
+                launch_y, launch_tick, velocity = fields[1:4]
+                entity.prev_y = launch_y + velocity * (tick - 1 - launch_tick)
+                entity.y = launch_y + velocity * (tick - launch_tick)
+                entity.age = tick - launch_tick
+                (player_projectiles if kind == KIND_PLAYER_PROJECTILE else enemy_projectiles).append(entity)
+        simulation.spaceships = spaceships
+        simulation.enemies = enemies
+        simulation.player_projectiles = player_projectiles
+        simulation.enemy_projectiles = enemy_projectiles
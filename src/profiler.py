@@ -0,0 +1,198 @@
+# profiler.py
+import csv
+import json
+import time
+from collections import deque
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        """
+        Initializes a reusable timer for one named phase of a frame.
+
+        Args:
+            profiler (FrameProfiler): The profiler to report to.
+            name (str): Name of the phase.
+        """
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off, so instrumented code needs no branches."""
+
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, capacity=600):
+        """
+        Initializes a profiler that keeps per-phase timings and entity counts for recent frames.
+
+        Args:
+            capacity (int): Number of frames kept in the ring buffer.
+        """
+        self.frames = deque(maxlen=capacity)
+        self.show_overlay = False
+        self.__phases = {}
+        self.__current = {}
+        self.__frame_start = None
+        self.__last_frame_start = None
+
+    def phase(self, name):
+        """
+        Returns a context manager that times one phase of the current frame.
+
+        Args:
+            name (str): Name of the phase, e.g. "update_game_state".
+
+        Returns:
+            _Phase: The reusable timer for the phase.
+        """
+        timer = self.__phases.get(name)
+        if timer is None:
+            timer = self.__phases[name] = _Phase(self, name)
+        return timer
+
+    def add_time(self, name, seconds):
+        """
+        Adds time to a phase of the current frame.
+
+        Args:
+            name (str): Name of the phase.
+            seconds (float): Time spent in the phase.
+        """
+        self.__current[name] = self.__current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        """
+        Marks the start of a frame.
+        """
+        self.__last_frame_start = self.__frame_start
+        self.__frame_start = time.perf_counter()
+        self.__current = {}
+
+    def end_frame(self, counts=None):
+        """
+        Stores the finished frame in the ring buffer.
+
+        Args:
+            counts (dict): Entity counts to record with the frame.
+        """
+        now = time.perf_counter()
+        interval = now - self.__last_frame_start if self.__last_frame_start is not None else None
+        self.frames.append({
+            "frame_ms": (now - self.__frame_start) * 1000,
+            "interval_ms": interval * 1000 if interval is not None else None,
+            "phases_ms": {name: seconds * 1000 for name, seconds in self.__current.items()},
+            "counts": dict(counts) if counts else {},
+        })
+
+    def get_stats(self):
+        """
+        Summarizes the frames in the ring buffer.
+
+        Returns:
+            dict: FPS, frame-time percentiles, mean time per phase and the latest entity counts.
+        """
+        if not self.frames:
+            return {"frames": 0}
+
+        frame_times = sorted(frame["frame_ms"] for frame in self.frames)
+        intervals = [frame["interval_ms"] for frame in self.frames if frame["interval_ms"]]
+        phase_totals = {}
+        for frame in self.frames:
+            for name, milliseconds in frame["phases_ms"].items():
+                phase_totals[name] = phase_totals.get(name, 0.0) + milliseconds
+
+        def percentile(fraction):
+            return frame_times[min(len(frame_times) - 1, int(fraction * len(frame_times)))]
+
+        return {
+            "frames": len(self.frames),
+            "fps": 1000 * len(intervals) / sum(intervals) if intervals else 0.0,
+            "frame_ms_p50": percentile(0.50),
+            "frame_ms_p95": percentile(0.95),
+            "frame_ms_p99": percentile(0.99),
+            "frame_ms_max": frame_times[-1],
+            "phases_ms_mean": {name: total / len(self.frames) for name, total in phase_totals.items()},
+            "counts": self.frames[-1]["counts"],
+        }
+
+    def draw_overlay(self, screen, font, position=(10, 40), color=(0, 0, 0)):
+        """
+        Draws FPS, frame-time percentiles and entity counts on the screen.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            font (pygame.font.Font): Font to render the overlay with.
+            position (tuple): Top-left corner of the overlay.
+            color (tuple): RGB color of the text.
+
+        Returns:
+            list: The rects drawn.
+        """
+        stats = self.get_stats()
+        if not stats["frames"]:
+            return []
+
+        lines = [
+            f"FPS {stats['fps']:.0f}  frame p50 {stats['frame_ms_p50']:.2f} ms  "
+            f"p95 {stats['frame_ms_p95']:.2f}  p99 {stats['frame_ms_p99']:.2f}",
+            "  ".join(f"{name} {milliseconds:.2f}" for name, milliseconds in stats["phases_ms_mean"].items()),
+            "  ".join(f"{name} {count}" for name, count in stats["counts"].items()),
+        ]
+        x, y = position
+        rects = []
+        for line in lines:
+            rects.append(screen.blit(font.render(line, True, color), (x, y)))
+            y += font.get_linesize()
+        return rects
+
+    def export(self, path):
+        """
+        Writes the frames in the ring buffer to a trace file.
+
+        Args:
+            path (str): Output path; a .csv suffix writes CSV, anything else writes JSON.
+        """
+        frames = list(self.frames)
+        if not path.endswith(".csv"):
+            with open(path, "w") as trace_file:
+                json.dump({"summary": self.get_stats(), "frames": frames}, trace_file, indent=1)
+            return
+
+        phase_names = sorted({name for frame in frames for name in frame["phases_ms"]})
+        count_names = sorted({name for frame in frames for name in frame["counts"]})
+        with open(path, "w", newline="") as trace_file:
+            writer = csv.writer(trace_file)
+            writer.writerow(["frame_ms", "interval_ms"] + phase_names + count_names)
+            for frame in frames:
+                writer.writerow([frame["frame_ms"], frame["interval_ms"]] +
+                                [frame["phases_ms"].get(name, 0.0) for name in phase_names] +
+                                [frame["counts"].get(name, 0) for name in count_names])
@@ -3,10 +3,28 @@ import pygame
 
 
 class Projectile:
+    # Projectiles are the most numerous entities, so they carry no per-instance __dict__
+    __slots__ = ("x", "y", "prev_x", "prev_y", "width", "height", "speed", "length", "direction", "age")
+
     def __init__(self, x, y, width, height, speed, length, direction):
         """
         Initializes a projectile with specified characteristics.
 
+        Args:
+            x (int): Initial x-coordinate.
+            y (int): Initial y-coordinate.
+            width (int): Width of the projectile.
+            height (int): Height of the projectile.
+            speed (int): Speed of the projectile.
+            length (int): Length of the projectile.
+            direction (str): Direction of the projectile ("up" or "down").
+        """
+        self.reset(x, y, width, height, speed, length, direction)
+
+    def reset(self, x, y, width, height, speed, length, direction):
+        """
+        Reinitializes the projectile so a pooled instance can be reused.
+
         Args:
             x (int): Initial x-coordinate.
             y (int): Initial y-coordinate.
@@ -18,20 +36,40 @@ class Projectile:
         """
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the last move, used by the swept collision tests
+        self.prev_y = y
         self.width = width
         self.height = height
         self.speed = speed
         self.length = length
         self.direction = direction
+        self.age = 0  # Number of moves since the projectile was fired
 
     def move(self):
         """
         Moves the projectile based on its direction and speed.
         """
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.direction == "up":
             self.y -= self.speed
         elif self.direction == "down":
             self.y += self.speed
+        self.age += 1
+
+    def is_off_screen(self, screen_width, screen_height):
+        """
+        Checks whether the projectile has fully left the screen.
+
+        Args:
+            screen_width (int): Width of the screen.
+            screen_height (int): Height of the screen.
+
+        Returns:
+            bool: True if no part of the projectile is visible, False otherwise.
+        """
+        return (self.y + self.length < 0 or self.y > screen_height or
+                self.x + self.width < 0 or self.x > screen_width)
 
     def draw(self, screen):
         """
@@ -0,0 +1,193 @@
+# projectile_pool.py
+import argparse
+import random
+import time
+import tracemalloc
+from projectile import Projectile
+
+
+class ProjectilePool:
+    def __init__(self, max_live=256, max_age=180):
+        """
+        Initializes a pool that recycles Projectile instances.
+
+        Args:
+            max_live (int): Maximum number of projectiles that may be live at once.
+            max_age (int): Number of moves after which a projectile is culled even if still on screen.
+        """
+        self.max_live = max_live
+        self.max_age = max_age
+        self.live_count = 0
+        self.__free = []
+        self.__created = 0
+        self.__reused = 0
+        self.__released = 0
+        self.__rejected = 0
+        self.__peak_live = 0
+
+    def acquire(self, x, y, width, height, speed, length, direction):
+        """
+        Returns a projectile from the pool, creating one only if none are free.
+
+        Args:
+            x (int): Initial x-coordinate.
+            y (int): Initial y-coordinate.
+            width (int): Width of the projectile.
+            height (int): Height of the projectile.
+            speed (int): Speed of the projectile.
+            length (int): Length of the projectile.
+            direction (str): Direction of the projectile ("up" or "down").
+
+        Returns:
+            Projectile: A ready-to-use projectile, or None if the live cap has been reached.
+        """
+        if self.live_count >= self.max_live:
+            self.__rejected += 1
+            return None
+
+        if self.__free:
+            projectile = self.__free.pop()
+            projectile.reset(x, y, width, height, speed, length, direction)
+            self.__reused += 1
+        else:
+            projectile = Projectile(x, y, width, height, speed, length, direction)
+            self.__created += 1
+
+        self.live_count += 1
+        if self.live_count > self.__peak_live:
+            self.__peak_live = self.live_count
+        return projectile
+
+    def release(self, projectile):
+        """
+        Returns a projectile to the pool so it can be reused.
+
+        Args:
+            projectile (Projectile): The projectile that is no longer live.
+        """
+        self.__free.append(projectile)
+        self.live_count -= 1
+        self.__released += 1
+
+    def cull(self, projectiles, screen_width, screen_height):
+        """
+        Releases every projectile that left the screen or outlived max_age.
+
+        Args:
+            projectiles (list): Live projectiles; culled entries are removed in place.
+            screen_width (int): Width of the screen.
+            screen_height (int): Height of the screen.
+        """
+        kept = []
+        for projectile in projectiles:
+            if projectile.age > self.max_age or projectile.is_off_screen(screen_width, screen_height):
+                self.release(projectile)
+            else:
+                kept.append(projectile)
+        projectiles[:] = kept
+
+    def release_all(self, projectiles):
+        """
+        Releases every projectile in the list and empties it.
+
+        Args:
+            projectiles (list): Live projectiles to return to the pool.
+        """
+        for projectile in projectiles:
+            self.release(projectile)
+        projectiles.clear()
+
+    def get_stats(self):
+        """
+        Returns pool statistics.
+
+        Returns:
+            dict: Live, free, created, reused, released, rejected and peak live counts.
+        """
+        return {
+            "live": self.live_count,
+            "free": len(self.__free),
+            "created": self.__created,
+            "reused": self.__reused,
+            "released": self.__released,
+            "rejected": self.__rejected,
+            "peak_live": self.__peak_live,
+        }
+
+
+def soak(minutes=60, seed=0, windows=12):
+    """
+    Plays a long headless game with random inputs and samples the pool, traced memory and tick time.
+
+    The random player dies and restarts many times, so projectiles are fired, culled, spent and released
+    throughout the run.
+
+    Args:
+        minutes (int): Simulated minutes of play at 60 ticks per second.
+        seed (int): Seed of the game and of its inputs.
+        windows (int): Number of equal windows the run is sampled in.
+
+    Returns:
+        list: One dict per window with the tick, pool live and created counts, traced memory in KB and mean
+        tick time in microseconds.
+    """
+    from simulation import Simulation  # Imported here because the simulation depends on the pool
+
+    simulation = Simulation(800, 600, seed=seed)
+    input_rng = random.Random(seed)
+    ticks_per_window = minutes * 60 * simulation.tick_rate // windows
+    samples = []
+    tracemalloc.start()
+    try:
+        for _ in range(windows):
+            start = time.perf_counter()
+            for _ in range(ticks_per_window):
+                simulation.step(input_rng.randrange(16))
+            elapsed = time.perf_counter() - start
+            stats = simulation.projectile_pool.get_stats()
+            samples.append({
+                "tick": simulation.tick,
+                "live": stats["live"],
+                "created": stats["created"],
+                "memory_kb": tracemalloc.get_traced_memory()[0] / 1024,
+                "tick_us": elapsed / ticks_per_window * 1e6,
+            })
+    finally:
+        tracemalloc.stop()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the projectile pool in a long headless game")
+    parser.add_argument("--minutes", type=int, default=60, help="simulated minutes of play")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--windows", type=int, default=12, help="number of samples taken")
+    args = parser.parse_args()
+
+    samples = soak(args.minutes, args.seed, args.windows)
+    for sample in samples:
+        print(f"tick {sample['tick']:>8}: {sample['live']:>3} live, {sample['created']:>3} created, "
+              f"{sample['memory_kb']:>7.1f}KB traced, {sample['tick_us']:>6.1f}us per tick")
+
+    # The first window includes warming up, the rest must stay flat
+    steady = samples[1:] if len(samples) > 1 else samples
+    half = len(steady) // 2 or 1
+    memory_growth = steady[-1]["memory_kb"] - steady[0]["memory_kb"]
+    time_ratio = (sum(sample["tick_us"] for sample in steady[half:]) / len(steady[half:]) /
+                  (sum(sample["tick_us"] for sample in steady[:half]) / half))
+    failures = []
+    # Without recycling every shot creates a projectile, thousands per window
+    if samples[-1]["created"] > samples[0]["created"] * 2:
+        failures.append(f"created projectiles grew from {samples[0]['created']} to {samples[-1]['created']}")
+    if memory_growth > 64:
+        failures.append(f"traced memory grew by {memory_growth:.1f}KB")
+    if time_ratio > 1.5:
+        failures.append(f"ticks got {time_ratio:.2f}x slower")
+    print(f"memory growth {memory_growth:+.1f}KB, tick time second half / first half {time_ratio:.2f}")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# renderer.py
+import pygame
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, background, enabled=True):
+        """
+        Initializes a renderer that only clears and pushes the screen areas that changed.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            background (tuple): RGB color used to erase the screen.
+            enabled (bool): If False, every frame clears the whole screen and flips it.
+        """
+        self.screen = screen
+        self.background = background
+        self.enabled = enabled
+        self.__previous_rects = []
+        self.__current_rects = []
+        self.__full_redraw = True
+
+    def invalidate(self):
+        """
+        Forces the next frame to clear and push the whole screen.
+        """
+        self.__full_redraw = True
+
+    def begin_frame(self):
+        """
+        Erases whatever was drawn in the previous frame.
+        """
+        if not self.enabled or self.__full_redraw:
+            self.screen.fill(self.background)
+        else:
+            for rect in self.__previous_rects:
+                self.screen.fill(self.background, rect)
+
+    def add(self, rect):
+        """
+        Records an area drawn this frame.
+
+        Args:
+            rect (pygame.Rect): The area that was drawn, ignored if None.
+        """
+        if rect is not None:
+            self.__current_rects.append(rect)
+
+    def add_many(self, rects):
+        """
+        Records several areas drawn this frame.
+
+        Args:
+            rects (list): The areas that were drawn.
+        """
+        self.__current_rects.extend(rects)
+
+    def present(self):
+        """
+        Pushes the frame to the display.
+
+        Returns:
+            int: Number of rectangles pushed, or 0 for a full-screen update.
+        """
+        if not self.enabled or self.__full_redraw:
+            pygame.display.flip()
+            self.__full_redraw = False
+            pushed = 0
+        else:
+            # Areas drawn last frame were erased, areas drawn this frame are new; both must be pushed
+            dirty = self.__previous_rects + self.__current_rects
+            pygame.display.update(dirty)
+            pushed = len(dirty)
+
+        self.__previous_rects = self.__current_rects
+        self.__current_rects = []
+        return pushed
@@ -0,0 +1,195 @@
+# replay.py
+import struct
+from simulation import Simulation
+
+# File layout: header, then one (input mask byte, varint run length) record per run of identical
+# inputs, then END_MARKER followed by varint tick count and varint final score.
+MAGIC = b"8BRP"
+VERSION = 5  # Version 5: enemy positions are evaluated on their solved path instead of summed up
+# magic, version, seed, tick_rate, width, height; the seed fits because Simulation keeps seeds to 64 unsigned bits
+HEADER = struct.Struct("<4sBQHHH")
+END_MARKER = 0xFF
+
+
+def _write_varint(stream, value):
+    """
+    Writes a non-negative integer as a little-endian base-128 varint.
+
+    Args:
+        stream: Binary file object to write to.
+        value (int): The value to write.
+    """
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            break
+    stream.write(out)
+
+
+def _read_varint(stream):
+    """
+    Reads a varint written by _write_varint.
+
+    Args:
+        stream: Binary file object to read from.
+
+    Returns:
+        int: The decoded value, or None at end of file.
+    """
+    value = 0
+    shift = 0
+    while True:
+        data = stream.read(1)
+        if not data:
+            return None
+        value |= (data[0] & 0x7F) << shift
+        if not data[0] & 0x80:
+            return value
+        shift += 7
+
+
+class ReplayRecorder:
+    def __init__(self, path, simulation):
+        """
+        Starts recording the inputs fed to a simulation into a streaming replay file.
+
+        Args:
+            path (str): Path of the replay file to create.
+            simulation (Simulation): The simulation being recorded, used for its seed and dimensions.
+        """
+        self.simulation = simulation
+        # Packed before the file is created, so a header that does not fit leaves no empty replay behind
+        header = HEADER.pack(MAGIC, VERSION, simulation.seed, simulation.tick_rate, simulation.width,
+                             simulation.height)
+        self.__file = open(path, "wb")
+        self.__file.write(header)
+        self.__current_inputs = None
+        self.__run_length = 0
+        self.ticks = 0
+
+    def record(self, inputs):
+        """
+        Records the inputs for one tick.
+
+        Args:
+            inputs (int): Bitwise OR of the INPUT_* flags applied this tick.
+        """
+        if inputs == self.__current_inputs:
+            self.__run_length += 1
+        else:
+            self.__flush_run()
+            self.__current_inputs = inputs
+            self.__run_length = 1
+        self.ticks += 1
+
+    def __flush_run(self):
+        """
+        Writes the current run of identical inputs, if any.
+        """
+        if self.__run_length:
+            self.__file.write(bytes((self.__current_inputs,)))
+            _write_varint(self.__file, self.__run_length)
+
+    def close(self):
+        """
+        Writes the trailer with the tick count and final score and closes the file.
+        """
+        if self.__file.closed:
+            return
+        self.__flush_run()
+        self.__file.write(bytes((END_MARKER,)))
+        _write_varint(self.__file, self.ticks)
+        _write_varint(self.__file, self.simulation.score)
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Replay:
+    def __init__(self, path):
+        """
+        Opens a replay file and reads its header.
+
+        Args:
+            path (str): Path of the replay file.
+
+        Raises:
+            ValueError: If the file is not a replay or uses an unsupported version.
+        """
+        self.path = path
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a replay")
+        magic, version, self.seed, self.tick_rate, self.width, self.height = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        self.ticks = None  # Filled in from the trailer once the inputs have been read
+        self.final_score = None
+
+    def inputs(self):
+        """
+        Yields the recorded inputs one tick at a time.
+
+        Files cut short by a crash are played up to the last complete run.
+
+        Yields:
+            int: Bitwise OR of the INPUT_* flags for each tick.
+        """
+        with open(self.path, "rb") as stream:
+            stream.seek(HEADER.size)
+            while True:
+                data = stream.read(1)
+                if not data:
+                    return
+                if data[0] == END_MARKER:
+                    self.ticks = _read_varint(stream)
+                    self.final_score = _read_varint(stream)
+                    return
+                run_length = _read_varint(stream)
+                if run_length is None:
+                    return
+                for _ in range(run_length):
+                    yield data[0]
+
+    def create_simulation(self):
+        """
+        Creates a simulation configured like the recorded one.
+
+        Returns:
+            Simulation: A fresh simulation with the recorded seed and dimensions.
+        """
+        return Simulation(self.width, self.height, tick_rate=self.tick_rate, seed=self.seed)
+
+    def play(self):
+        """
+        Feeds the recorded inputs through a headless simulation as fast as possible.
+
+        Returns:
+            Simulation: The simulation after the last recorded tick.
+        """
+        simulation = self.create_simulation()
+        for inputs in self.inputs():
+            simulation.step(inputs)
+        return simulation
+
+    def verify(self):
+        """
+        Replays the file and checks the outcome against the recorded trailer.
+
+        Returns:
+            bool: True if the replay reproduces the recorded tick count and score.
+        """
+        simulation = self.play()
+        return simulation.tick == self.ticks and simulation.score == self.final_score
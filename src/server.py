@@ -0,0 +1,137 @@
+# server.py
+import asyncio
+import json
+import logging
+from simulation import Simulation
+from netsync import DeltaEncoder
+
+logger = logging.getLogger("8bit.server")
+
+
+class GameServer:
+    def __init__(self, width=800, height=600, players=2, tick_rate=60, seed=None, host="127.0.0.1", port=8765,
+                 max_buffered=256 * 1024):
+        """
+        Initializes an authoritative match server that runs the simulation headless for several clients.
+
+        Clients connect over TCP and exchange newline-delimited JSON messages. A client sends
+        {"type": "input", "inputs": mask} whenever its held INPUT_* flags change; the server applies every
+        player's latest inputs each tick and broadcasts one delta-compressed state message per tick.
+
+        Args:
+            width (int): Width of the playing field.
+            height (int): Height of the playing field.
+            players (int): Number of players in the match; the match starts once all of them are connected.
+            tick_rate (int): Simulation ticks per second.
+            seed (int): Seed for the simulation, random if omitted.
+            host (str): Address to listen on.
+            port (int): TCP port to listen on, 0 to pick a free one.
+            max_buffered (int): Bytes that may queue up for a client before it is dropped as too slow.
+        """
+        self.host = host
+        self.port = port
+        self.max_buffered = max_buffered
+        self.simulation = Simulation(width, height, tick_rate=tick_rate, seed=seed, players=players)
+        self.encoder = DeltaEncoder()
+        self.inputs = [0] * players  # Latest INPUT_* flags of each player
+        self.bytes_sent = 0
+        self.__writers = [None] * players  # Connected client of each player slot
+        self.__all_connected = None
+        self.__server = None
+
+    async def start(self):
+        """
+        Starts listening; the actual port is available in self.port afterwards.
+        """
+        self.__all_connected = asyncio.Event()
+        self.__server = await asyncio.start_server(self.__handle_client, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+        logger.info("listening on %s:%d for %d players", self.host, self.port, len(self.__writers))
+
+    async def run(self, ticks=None):
+        """
+        Waits for every player to connect, then runs the match at the fixed tick rate.
+
+        Args:
+            ticks (int): Number of ticks to run, forever if omitted.
+        """
+        if self.__server is None:
+            await self.start()
+        await self.__all_connected.wait()
+        loop = asyncio.get_running_loop()
+        tick_seconds = 1 / self.simulation.tick_rate
+        next_tick = loop.time()
+        while ticks is None or self.simulation.tick < ticks:
+            self.simulation.step(list(self.inputs))
+            self.__broadcast(self.encoder.encode(self.simulation))
+            next_tick += tick_seconds
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    async def close(self):
+        """
+        Disconnects every client and stops listening.
+        """
+        for writer in self.__writers:
+            if writer is not None:
+                writer.close()
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+    def __send(self, writer, message):
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    def __broadcast(self, message):
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        for player, writer in enumerate(self.__writers):
+            if writer is None:
+                continue
+            # Never wait for a client: one that cannot keep up is dropped instead of stalling the match
+            unsent = writer.transport.get_write_buffer_size()
+            if unsent > self.max_buffered:
+                logger.warning("dropping player %d: %d bytes unsent", player, unsent)
+                writer.close()
+                self.__writers[player] = None
+                self.inputs[player] = 0
+                continue
+            writer.write(data)
+            self.bytes_sent += len(data)
+
+    async def __handle_client(self, reader, writer):
+        if None not in self.__writers:
+            self.__send(writer, {"type": "error", "message": "match is full"})
+            writer.close()
+            return
+        player = self.__writers.index(None)
+        self.__writers[player] = writer
+        simulation = self.simulation
+        self.__send(writer, {"type": "welcome", "player": player, "players": simulation.players,
+                             "width": simulation.width, "height": simulation.height,
+                             "tick_rate": simulation.tick_rate})
+        # A client joining between ticks starts from the current baseline and then follows the deltas
+        self.__send(writer, self.encoder.full_state(simulation))
+        logger.info("player %d connected", player)
+        if None not in self.__writers:
+            self.__all_connected.set()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get("type") == "input" and self.__writers[player] is writer:
+                    self.inputs[player] = int(message.get("inputs", 0))
+        except ConnectionError:
+            pass
+        finally:
+            if self.__writers[player] is writer:
+                self.__writers[player] = None
+                self.inputs[player] = 0  # A disconnected player stops moving and shooting
+                logger.info("player %d disconnected", player)
+            writer.close()
@@ -0,0 +1,437 @@
+# simulation.py
+from spaceship import Spaceship
+from waves import WaveScheduler, load_wave_table
+from projectile_pool import ProjectilePool
+from collision import SpatialHash, sweep_bounds, projectile_hit_time
+from profiler import NULL_PROFILER
+from enemy_behaviour import next_shot_tick
+from events import NULL_EVENT_BUS, ENEMY_KILLED, PLAYER_HIT, WAVE_SPAWNED, GAME_OVER
+import random
+
+# Input bit flags accepted by Simulation.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SHOOT = 4
+INPUT_RESTART = 8
+
+SEED_MASK = 2 ** 64 - 1  # Seeds are kept to 64 unsigned bits, the size snapshots and replays store them in
+
+
+class Simulation:
+    def __init__(self, width, height, tick_rate=60, seed=None, wave_table=None, players=1, entity_store=False):
+        """
+        Initializes the game simulation without any display or wall clock.
+
+        Args:
+            width (int): Width of the playing field.
+            height (int): Height of the playing field.
+            tick_rate (int): Number of simulation ticks per simulated second.
+            seed (int): Seed for the simulation's random generator, a random seed is chosen if omitted. Seeds are
+                taken modulo 2**64, so negative seeds are kept as their unsigned 64-bit equivalent.
+            wave_table (dict): Wave table to play, the bundled waves.json is used if omitted.
+            players (int): Number of player spaceships sharing the match.
+            entity_store (bool): Keep enemies and projectiles in NumPy arrays and move, cull and hit-test them in
+                batches, see StoredEntities. The entity lists are then rebuilt from the arrays on every read, so
+                entities are added with add_enemies and the projectile pool instead of by appending to them.
+        """
+        self.seed = seed & SEED_MASK if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)  # All gameplay randomness must come from here to keep runs replayable
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate  # Default simulated time per tick in milliseconds
+        self.tick = 0
+        self.time_ms = 0
+        self.time_offset = 0  # Extra milliseconds from custom dt steps; time_ms is tick * tick_ms plus this
+        self.players = players
+        self.last_shot_times = [0] * players  # Simulation time of each player's last shot
+        self.score = 0  # Shared by all players
+        if entity_store:
+            from entity_store import StoredEntities  # Imported here because NumPy is only needed in this mode
+            self.stored_entities = StoredEntities(max_live=512)
+            self.projectile_pool = self.stored_entities.pool
+        else:
+            self.stored_entities = None
+            self.projectile_pool = ProjectilePool(max_live=512)  # Recycles projectiles across frames and restarts
+        self.collision_grid = SpatialHash(cell_size=64)  # Broad phase shared by the collision checks
+        self.__enemies = []
+        self.__player_projectiles = []
+        self.__enemy_projectiles = []
+        self.profiler = NULL_PROFILER  # Replaced by a FrameProfiler to time the collision checks
+        self.events = NULL_EVENT_BUS  # Replaced by an EventBus to log gameplay events
+        self.waves = WaveScheduler(wave_table if wave_table is not None else load_wave_table(), self.rng)
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the game state to the initial configuration.
+        """
+        if self.players == 1:
+            self.spaceships = [Spaceship(name="Player", x=self.width // 2, y=self.height - 60, width=50, height=50)]
+        else:
+            # Spread the players evenly along the bottom of the screen
+            self.spaceships = [Spaceship(name=f"Player {index + 1}",
+                                         x=self.width * (index + 1) // (self.players + 1) - 25,
+                                         y=self.height - 60, width=50, height=50)
+                               for index in range(self.players)]
+        self.projectile_pool.release_all(self.player_projectiles)
+        self.projectile_pool.release_all(self.enemy_projectiles)
+        self.waves.start(self.time_ms)
+        enemies = self.waves.spawn_due(self.time_ms)
+        self.enemies = enemies
+        self.events.post(WAVE_SPAWNED, tick=self.tick, wave=self.waves.wave, size=len(enemies))
+        self.score = 0  # Reset score to 0 on restart
+
+    @property
+    def enemies(self):
+        """Live enemies in spawn order."""
+        if self.stored_entities is not None:
+            return self.stored_entities.enemy_list()
+        return self.__enemies
+
+    @enemies.setter
+    def enemies(self, new_enemies):
+        if self.stored_entities is not None:
+            self.stored_entities.set_enemies(new_enemies)
+        else:
+            self.__enemies = new_enemies
+
+    @property
+    def player_projectiles(self):
+        """Live projectiles of the players in the order they were fired."""
+        if self.stored_entities is not None:
+            return self.stored_entities.projectile_list(self.projectile_pool.player_projectiles)
+        return self.__player_projectiles
+
+    @player_projectiles.setter
+    def player_projectiles(self, new_player_projectiles):
+        if self.stored_entities is not None:
+            self.stored_entities.set_projectiles(self.projectile_pool.player_projectiles, new_player_projectiles)
+        else:
+            self.__player_projectiles = new_player_projectiles
+
+    @property
+    def enemy_projectiles(self):
+        """Live projectiles of the enemies in the order they were fired."""
+        if self.stored_entities is not None:
+            return self.stored_entities.projectile_list(self.projectile_pool.enemy_projectiles)
+        return self.__enemy_projectiles
+
+    @enemy_projectiles.setter
+    def enemy_projectiles(self, new_enemy_projectiles):
+        if self.stored_entities is not None:
+            self.stored_entities.set_projectiles(self.projectile_pool.enemy_projectiles, new_enemy_projectiles)
+        else:
+            self.__enemy_projectiles = new_enemy_projectiles
+
+    def add_enemies(self, enemies):
+        """
+        Adds enemies after the live ones.
+
+        Args:
+            enemies (list): The new enemies; with an entity store they are copied into it.
+        """
+        if self.stored_entities is not None:
+            self.stored_entities.add_enemies(enemies)
+        else:
+            self.__enemies.extend(enemies)
+
+    def get_entity_counts(self):
+        """
+        Returns the number of live entities of each kind.
+
+        Returns:
+            dict: Enemy, player projectile and enemy projectile counts.
+        """
+        if self.stored_entities is not None:
+            return {
+                "enemies": len(self.stored_entities.enemies),
+                "player_projectiles": len(self.projectile_pool.player_projectiles),
+                "enemy_projectiles": len(self.projectile_pool.enemy_projectiles),
+            }
+        return {
+            "enemies": len(self.__enemies),
+            "player_projectiles": len(self.__player_projectiles),
+            "enemy_projectiles": len(self.__enemy_projectiles),
+        }
+
+    def predict_enemies(self, ticks):
+        """
+        Predicts where the current enemies will be and when they will shoot, without stepping the simulation.
+
+        Enemy paths and shot times follow from their spawn parameters alone, so this costs one path evaluation
+        per enemy and one solve per shot in between, however far ahead it looks. Kills, spawns and custom dt
+        steps in between are not foreseen.
+
+        Args:
+            ticks (int): Number of ticks ahead, at least 0.
+
+        Returns:
+            list: (enemy, x, y, shot_tick) for every live enemy, where shot_tick is the first tick at or after
+            tick + ticks at which the enemy shoots.
+
+        Raises:
+            ValueError: If ticks is negative.
+        """
+        if ticks < 0:
+            raise ValueError("Only ticks ahead can be predicted; Enemy.position_at looks back along a path")
+        target = self.tick + ticks
+        predictions = []
+        for enemy in self.enemies:
+            if not enemy.is_alive:
+                continue
+            x, y = enemy.position_at(ticks, self.width)
+            # A shot that is already due happens on the next update
+            shot_tick = max(next_shot_tick(enemy.get_last_shot_time(), enemy.shoot_rate, self.tick_ms,
+                                           self.time_offset), self.tick + 1)
+            while shot_tick < target:
+                shot_tick = next_shot_tick(shot_tick * self.tick_ms + self.time_offset, enemy.shoot_rate,
+                                           self.tick_ms, self.time_offset)
+            predictions.append((enemy, x, y, shot_tick))
+        return predictions
+
+    @property
+    def player_spaceship(self):
+        """The first player's spaceship, the only one in a single-player game."""
+        return self.spaceships[0]
+
+    @player_spaceship.setter
+    def player_spaceship(self, new_player_spaceship):
+        self.spaceships[0] = new_player_spaceship
+
+    @property
+    def last_player_shot_time(self):
+        """Simulation time of the first player's last shot."""
+        return self.last_shot_times[0]
+
+    @last_player_shot_time.setter
+    def last_player_shot_time(self, new_last_player_shot_time):
+        self.last_shot_times[0] = new_last_player_shot_time
+
+    @property
+    def is_game_over(self):
+        """Whether every player has run out of lives."""
+        for spaceship in self.spaceships:
+            if spaceship.lives > 0:
+                return False
+        return True
+
+    def step(self, inputs=0, dt=None):
+        """
+        Advances the simulation by one tick.
+
+        Args:
+            inputs (int or list): Bitwise OR of the INPUT_* flags held during this tick, or one such value per
+                player in a multiplayer game.
+            dt (float): Simulated milliseconds covered by this tick, defaults to 1000 / tick_rate.
+        """
+        self.tick += 1
+        if dt is not None:
+            self.time_offset += dt - self.tick_ms
+            for enemy in self.enemies:
+                enemy.next_shot_tick = 0  # The shot schedules assumed the old offset
+        # Derived from the tick instead of summed up, so enemy shot ticks can be solved for in closed form
+        self.time_ms = self.tick * self.tick_ms + self.time_offset
+        for spaceship in self.spaceships:
+            spaceship.prev_x = spaceship.x  # The swept collision tests cover the movement from here
+            spaceship.prev_y = spaceship.y
+        if isinstance(inputs, int):
+            self.apply_input(inputs)
+        else:
+            for player, player_inputs in enumerate(inputs):
+                self.apply_input(player_inputs, player)
+        self.update()
+
+    def apply_input(self, inputs, player=0):
+        """
+        Applies one player's inputs for the current tick.
+
+        A player without lives left can only restart a finished game.
+
+        Args:
+            inputs (int): Bitwise OR of the INPUT_* flags.
+            player (int): Index of the player.
+        """
+        spaceship = self.spaceships[player]
+        if spaceship.lives > 0:
+            if inputs & INPUT_LEFT:
+                spaceship.move(-5, 0, self.width)
+            if inputs & INPUT_RIGHT:
+                spaceship.move(5, 0, self.width)
+            if inputs & INPUT_SHOOT:
+                self.shoot_projectile(player)
+        if inputs & INPUT_RESTART and self.is_game_over:
+            self.reset()
+
+    def shoot_projectile(self, player=0):
+        """
+        Fires a projectile from a player's spaceship if the cooldown time has passed.
+
+        Args:
+            player (int): Index of the player.
+        """
+        time_since_last_shot = self.time_ms - self.last_shot_times[player]
+        if time_since_last_shot > 200:
+            spaceship = self.spaceships[player]
+            new_projectile = self.projectile_pool.acquire(
+                x=spaceship.x + spaceship.width // 2 - 5,
+                y=spaceship.y,
+                width=10,
+                height=spaceship.height,
+                speed=10,
+                length=spaceship.height,
+                direction="up")
+            if new_projectile and self.stored_entities is None:  # A stored projectile is listed by its store
+                self.__player_projectiles.append(new_projectile)
+            self.last_shot_times[player] = self.time_ms
+
+    def update(self):
+        """
+        Updates the game state, including moving objects, handling collisions, and updating scores.
+        """
+        tick = self.tick
+        if self.stored_entities is not None:
+            # The stores move every entity in one batch; only the enemies due to shoot need a call
+            for enemy in self.stored_entities.move_enemies(tick, self.width):
+                enemy.shoot_projectile(self.time_ms, self.projectile_pool)
+                enemy.next_shot_tick = next_shot_tick(enemy.get_last_shot_time(), enemy.shoot_rate, self.tick_ms,
+                                                      self.time_offset)
+            self.stored_entities.move_projectiles()
+        else:
+            for enemy in self.__enemies:
+                enemy.move(self.width, self.height, self.time_ms)
+                # Enemies are only asked to shoot on the tick their cooldown runs out, not every tick
+                if tick >= enemy.next_shot_tick:
+                    new_enemy_projectile = enemy.shoot_projectile(self.time_ms, self.projectile_pool)
+                    if new_enemy_projectile:
+                        self.__enemy_projectiles.append(new_enemy_projectile)
+                    enemy.next_shot_tick = next_shot_tick(enemy.get_last_shot_time(), enemy.shoot_rate,
+                                                          self.tick_ms, self.time_offset)
+
+            # Update projectile positions
+            for projectile in self.__player_projectiles:
+                projectile.move()
+            for projectile in self.__enemy_projectiles:
+                projectile.move()
+
+        # Check for collisions and remove enemies immediately
+        with self.profiler.phase("check_enemy_collisions"):
+            self.check_enemy_collisions()
+
+        # Check for collisions with player spaceship
+        with self.profiler.phase("check_player_collision"):
+            self.check_player_collision()
+
+        # Return projectiles that left the screen to the pool, after the collision checks so that a projectile
+        # leaving the screen this tick can still hit something on its way out
+        if self.stored_entities is not None:
+            self.projectile_pool.cull_all(self.width, self.height)
+        else:
+            self.projectile_pool.cull(self.__player_projectiles, self.width, self.height)
+            self.projectile_pool.cull(self.__enemy_projectiles, self.width, self.height)
+
+        # Update blinking status of the player spaceships
+        for spaceship in self.spaceships:
+            spaceship.update_blinking(self.time_ms)
+
+    def check_enemy_collisions(self):
+        """
+        Checks for collisions between player projectiles and enemies, updating scores and spawning new enemies.
+        """
+        wave = self.waves.wave
+        if self.stored_entities is not None:
+            for projectile, target in self.stored_entities.enemy_hits():
+                self.__destroy_enemy(target, projectile)
+        else:
+            self.__check_enemy_collisions()
+
+        # Spawn the members of the current wave that are due, including a wave started by the kills above
+        self.add_enemies(self.waves.spawn_due(self.time_ms))
+        if self.waves.wave != wave:
+            self.events.post(WAVE_SPAWNED, tick=self.tick, wave=self.waves.wave,
+                             size=self.waves.remaining.get(self.waves.wave, 0))
+
+    def __check_enemy_collisions(self):
+        grid = self.collision_grid
+        grid.clear()
+        for enemy in self.__enemies:
+            # Each enemy is stored with the box it covered this tick so most candidates are rejected without
+            # the exact swept test
+            left, top, width, height = sweep_bounds(enemy, enemy.height)
+            grid.insert((enemy, left, top, left + width, top + height), left, top, width, height)
+
+        destroyed = False
+        remaining_projectiles = []
+        for projectile in self.__player_projectiles:
+            # Only enemies whose path overlaps the projectile's path can be hit by it, and the first one it
+            # reaches during the tick takes the hit
+            x, y, width, height = sweep_bounds(projectile, projectile.length)
+            right = x + width
+            bottom = y + height
+            target = None
+            target_time = 1.0
+            target_index = 0
+            for index, (enemy, left, top, enemy_right, enemy_bottom) in grid.query_entries(x, y, width, height):
+                if left < right and x < enemy_right and top < bottom and y < enemy_bottom and enemy.is_alive:
+                    hit_time = projectile_hit_time(projectile, enemy)
+                    # Simultaneous hits go to the enemy that comes first in the enemy list
+                    if hit_time is not None and (hit_time < target_time or
+                                                 (hit_time == target_time and index < target_index)):
+                        target = enemy
+                        target_time = hit_time
+                        target_index = index
+            if target is None:
+                remaining_projectiles.append(projectile)
+            else:
+                self.__destroy_enemy(target, projectile)
+                destroyed = True
+        self.__player_projectiles = remaining_projectiles
+
+        if destroyed:
+            # Drop every destroyed enemy in one pass instead of one list.remove per kill
+            self.__enemies = [enemy for enemy in self.__enemies if enemy.is_alive]
+
+    def __destroy_enemy(self, target, projectile):
+        target.destroy(self.time_ms)
+        self.score += 10  # Increase the score when an enemy is hit
+        self.events.post(ENEMY_KILLED, tick=self.tick, eid=target.eid, score=self.score)
+        self.waves.on_enemy_destroyed(target, self.time_ms)
+        # The projectile is spent once it hits an enemy
+        self.projectile_pool.release(projectile)
+
+    def check_player_collision(self):
+        """
+        Checks for collisions between enemy projectiles and the players' spaceships, updating lives and hit status.
+        """
+        for player, spaceship in enumerate(self.spaceships):
+            if spaceship.lives <= 0:
+                continue  # A destroyed spaceship is no longer in the way
+            # With a single target the broad phase is one box test against the area the spaceship covered this tick
+            left, top, width, height = sweep_bounds(spaceship, spaceship.height)
+            right = left + width
+            bottom = top + height
+
+            spaceship_hit = False
+            if self.stored_entities is not None:
+                for projectile in self.stored_entities.enemy_projectiles_near(left, top, right, bottom):
+                    if spaceship.is_hit_by_enemy(projectile, self.time_ms):
+                        self.projectile_pool.release(projectile)  # The projectile is spent once it hits the player
+                        spaceship_hit = True
+                        break
+            else:
+                for index, projectile in enumerate(self.__enemy_projectiles):
+                    x, y, width, height = sweep_bounds(projectile, projectile.length)
+                    if (x < right and left < x + width and y < bottom and top < y + height and
+                            spaceship.is_hit_by_enemy(projectile, self.time_ms)):
+                        # The projectile is spent once it hits the player
+                        del self.__enemy_projectiles[index]
+                        self.projectile_pool.release(projectile)
+                        spaceship_hit = True
+                        break
+            if spaceship_hit:
+                spaceship.reset_hit_status()  # Reset hit status for the next frame
+                spaceship.decrement_lives()  # Decrement lives when hit
+                self.events.post(PLAYER_HIT, tick=self.tick, player=player, x=spaceship.x, y=spaceship.y,
+                                 lives=spaceship.lives)
+                if spaceship.lives == 0 and self.is_game_over:
+                    self.events.post(GAME_OVER, tick=self.tick, score=self.score)
@@ -1,7 +1,14 @@
 import pygame
+from collision import projectile_hit_time
 
 
 class Spaceship:
+    # Position and size are plain slots since collision and drawing read them constantly; lives stays a
+    # validated property
+    __slots__ = ("x", "y", "prev_x", "prev_y", "width", "height", "__name", "__lives", "__hit_by_projectile",
+                 "__hit_cooldown", "__last_hit_time", "__blink_duration", "__blink_timer", "__is_blinking",
+                 "__blink_color")
+
     def __init__(self, name, x, y, width, height):
         """Initializes a Spaceship object.
 
@@ -13,10 +20,12 @@ class Spaceship:
             height (int): The height of the spaceship.
         """
         self.__name = name
-        self.__x = x
-        self.__y = y
-        self.__width = width
-        self.__height = height
+        self.x = x
+        self.y = y
+        self.prev_x = x  # Position at the start of the current tick, used by the swept collision tests
+        self.prev_y = y
+        self.width = width
+        self.height = height
         self.__lives = 5
         self.__hit_by_projectile = False  # Flag to track if the spaceship has been hit by a projectile
         self.__hit_cooldown = 1000  # Cooldown period in milliseconds
@@ -31,46 +40,6 @@ class Spaceship:
         """Getter for the name property."""
         return self.__name
 
-    @property
-    def x(self):
-        """Getter for the x property."""
-        return self.__x
-
-    @x.setter
-    def x(self, x):
-        """Setter for the x property."""
-        self.__x = x
-
-    @property
-    def y(self):
-        """Getter for the y property."""
-        return self.__y
-
-    @y.setter
-    def y(self, y):
-        """Setter for the y property."""
-        self.__y = y
-
-    @property
-    def width(self):
-        """Getter for the width property."""
-        return self.__width
-
-    @width.setter
-    def width(self, width):
-        """Setter for the width property."""
-        self.__width = width
-
-    @property
-    def height(self):
-        """Getter for the height property."""
-        return self.__height
-
-    @height.setter
-    def height(self, height):
-        """Setter for the height property."""
-        self.__height = height
-
     @property
     def lives(self):
         """Getter for the lives property."""
@@ -93,39 +62,38 @@ class Spaceship:
         if self.__lives > 0:
             self.__lives += 1
 
-    def move(self, dx, dy):
+    def move(self, dx, dy, screen_width=800):
         """Moves the spaceship by the specified amount.
 
         Args:
             dx (int): The change in x-coordinate.
             dy (int): The change in y-coordinate.
+            screen_width (int): The width of the playing field.
         """
         # Ensure the spaceship stays within the screen boundaries in the x-direction
-        new_x = self.__x + dx
-        if 0 <= new_x <= (800 - self.__width):  # Max x-bounds, dependent on the screen width
-            self.__x = new_x
+        new_x = self.x + dx
+        if 0 <= new_x <= (screen_width - self.width):  # Max x-bounds, dependent on the screen width
+            self.x = new_x
 
-        self.__y += dy
+        self.y += dy
 
-    def is_hit_by_enemy(self, projectile):
-        """Checks if the spaceship is hit by an enemy projectile.
+    def is_hit_by_enemy(self, projectile, current_time):
+        """Checks if the spaceship is hit by an enemy projectile at any point of the current tick.
 
         Args:
             projectile (Projectile): The enemy projectile.
+            current_time (float): The current simulation time in milliseconds.
 
         Returns:
             bool: True if hit, False otherwise.
         """
-        if not self.__hit_by_projectile and (self.__x < projectile.x < self.__x + self.__width) and (
-                self.__y < projectile.y < self.__y + self.__height):
-            current_time = pygame.time.get_ticks()
+        if not self.__hit_by_projectile and projectile_hit_time(projectile, self) is not None:
             time_since_last_hit = current_time - self.__last_hit_time
 
             if time_since_last_hit > self.__hit_cooldown:
-                print(f"Spaceship hit by enemy projectile: {self.__x}, {self.__y}, {self.__width}, {self.__height}")
                 self.__hit_by_projectile = True
                 self.__last_hit_time = current_time
-                self.start_blinking()  # Start the blinking effect
+                self.start_blinking(current_time)  # Start the blinking effect
                 return True
 
         return False
@@ -134,14 +102,38 @@ class Spaceship:
         """Resets hit status for the next frame."""
         self.__hit_by_projectile = False
 
-    def draw(self, screen):
-        """Draws the spaceship on the screen.
+    def get_state(self):
+        """Returns the complete state of the spaceship except its name, e.g. for snapshots.
+
+        Returns:
+            tuple: (x, y, prev_x, prev_y, width, height, lives, hit_by_projectile, hit_cooldown, last_hit_time,
+            blink_duration, blink_timer, is_blinking, blink_color)
+        """
+        return (self.x, self.y, self.prev_x, self.prev_y, self.width, self.height, self.__lives,
+                self.__hit_by_projectile, self.__hit_cooldown, self.__last_hit_time, self.__blink_duration,
+                self.__blink_timer, self.__is_blinking, self.__blink_color)
+
+    def set_state(self, state):
+        """Overwrites the complete state of the spaceship except its name.
 
         Args:
-            screen (pygame.Surface): The surface to draw on.
+            state (tuple): A state as returned by get_state.
         """
-        current_time = pygame.time.get_ticks()
+        (x, y, prev_x, prev_y, width, height, lives, self.__hit_by_projectile, self.__hit_cooldown,
+         self.__last_hit_time, self.__blink_duration, self.__blink_timer, self.__is_blinking,
+         self.__blink_color) = state
+        self.x, self.y, self.prev_x, self.prev_y, self.width, self.height = x, y, prev_x, prev_y, width, height
+        self.lives = lives  # Validated like any other change of lives
 
+    def get_color(self, current_time):
+        """Returns the color the spaceship should be drawn in this frame.
+
+        Args:
+            current_time (float): The current simulation time in milliseconds.
+
+        Returns:
+            Tuple: RGB color tuple, or None if the spaceship is not drawn this frame.
+        """
         if self.__is_blinking:
             elapsed_time = current_time - self.__blink_timer
 
@@ -152,27 +144,49 @@ class Spaceship:
                 else:
                     self.__blink_color = (0, 0, 255)  # Blue
 
-                pygame.draw.rect(screen, self.__blink_color, (self.__x, self.__y, self.__width, self.__height))
+                return self.__blink_color
             else:
                 # Stop blinking after one second
                 self.__is_blinking = False
+                return None
         else:
             # Draw the spaceship normally
-            pygame.draw.rect(screen, (0, 128, 255), (self.__x, self.__y, self.__width, self.__height))
+            return (0, 128, 255)
+
+    def draw(self, screen, current_time):
+        """Draws the spaceship on the screen.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            current_time (float): The current simulation time in milliseconds.
+
+        Returns:
+            pygame.Rect: The area drawn, or None if nothing was drawn this frame.
+        """
+        color = self.get_color(current_time)
+        if color is None:
+            return None
+        return pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+
+    def start_blinking(self, current_time):
+        """Starts the blinking effect.
 
-    def start_blinking(self):
-        """Starts the blinking effect."""
+        Args:
+            current_time (float): The current simulation time in milliseconds.
+        """
         self.__is_blinking = True
-        self.__blink_timer = pygame.time.get_ticks()
+        self.__blink_timer = current_time
 
     def stop_blinking(self):
         """Stops the blinking effect."""
         self.__is_blinking = False
 
-    def update_blinking(self):
-        """Updates the blinking effect."""
-        current_time = pygame.time.get_ticks()
+    def update_blinking(self, current_time):
+        """Updates the blinking effect.
 
+        Args:
+            current_time (float): The current simulation time in milliseconds.
+        """
         if self.__is_blinking:
             elapsed_time = current_time - self.__blink_timer
 
@@ -0,0 +1,74 @@
+# sprites.py
+import pygame
+
+
+class SpriteCache:
+    def __init__(self):
+        """
+        Initializes a cache of pre-rendered entity surfaces keyed by size and color.
+        """
+        self.__surfaces = {}
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    def get(self, width, height, color):
+        """
+        Returns the surface for an entity, baking it on first use.
+
+        Args:
+            width (int): Width of the entity.
+            height (int): Height of the entity.
+            color (tuple): RGB color of the entity.
+
+        Returns:
+            pygame.Surface: A surface ready to be blitted.
+        """
+        key = (width, height, color)
+        surface = self.__surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()  # Match the display format so blits need no conversion
+            self.__surfaces[key] = surface
+        return surface
+
+    def clear(self):
+        """
+        Drops every baked surface, e.g. after the display mode changes.
+        """
+        self.__surfaces.clear()
+
+    def draw_rects(self, screen, entities, color=None, height_attribute="height", alpha=None):
+        """
+        Draws a layer of rectangular entities with a single Surface.blits call.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            entities (list): Objects with x, y, width and a height attribute.
+            color (tuple): RGB color shared by the layer, or None to use each entity's get_color().
+            height_attribute (str): Name of the attribute holding the drawn height, e.g. "length" for projectiles.
+            alpha (float): If given, draw each entity this far between its prev_x/prev_y and x/y position.
+
+        Returns:
+            list: The rects drawn.
+        """
+        get = self.get
+        if alpha is not None:
+            positions = [(entity.prev_x + (entity.x - entity.prev_x) * alpha,
+                          entity.prev_y + (entity.y - entity.prev_y) * alpha) for entity in entities]
+            if color is None:
+                surfaces = [get(entity.width, getattr(entity, height_attribute), entity.get_color())
+                            for entity in entities]
+            else:
+                surfaces = [get(entity.width, getattr(entity, height_attribute), color) for entity in entities]
+            return screen.blits(list(zip(surfaces, positions)))
+
+        if color is None:
+            batch = [(get(entity.width, getattr(entity, height_attribute), entity.get_color()), (entity.x, entity.y))
+                     for entity in entities]
+        else:
+            batch = [(get(entity.width, getattr(entity, height_attribute), color), (entity.x, entity.y))
+                     for entity in entities]
+        return screen.blits(batch)
@@ -0,0 +1,67 @@
+# text_cache.py
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, max_entries=64):
+        """
+        Initializes an LRU cache of rendered text surfaces.
+
+        Args:
+            max_entries (int): Maximum number of surfaces kept before the least recently used is evicted.
+        """
+        self.max_entries = max_entries
+        self.__surfaces = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Returns the rendered surface for a piece of text, rendering it only on a cache miss.
+
+        Args:
+            font (pygame.font.Font): Font to render with.
+            text (str): Text to render.
+            color (tuple): RGB color of the text.
+            antialias (bool): Whether to render with antialiasing.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, color, antialias, font)
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.__surfaces.move_to_end(key)
+            self.__hits += 1
+            return surface
+
+        self.__misses += 1
+        surface = font.render(text, antialias, color)
+        self.__surfaces[key] = surface
+        if len(self.__surfaces) > self.max_entries:
+            self.__surfaces.popitem(last=False)
+            self.__evictions += 1
+        return surface
+
+    def clear(self):
+        """
+        Drops every cached surface.
+        """
+        self.__surfaces.clear()
+
+    def get_stats(self):
+        """
+        Returns cache statistics.
+
+        Returns:
+            dict: Entry, hit, miss and eviction counts and the hit rate.
+        """
+        lookups = self.__hits + self.__misses
+        return {
+            "entries": len(self.__surfaces),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "hit_rate": self.__hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,216 @@
+# waves.py
+import json
+import os
+from enemy import Enemy
+
+DEFAULT_WAVE_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waves.json")
+
+
+def load_wave_table(path=DEFAULT_WAVE_TABLE):
+    """
+    Loads a wave table from a JSON or TOML file.
+
+    The table has a "waves" list, each wave holding an "enemies" list of spawn entries, and an optional
+    "endless" section describing the random groups that follow the last wave. A spawn entry takes
+    x, y, speed and shoot_rate, plus the optional keys eid, delay_ms (spawn time after the wave starts),
+    count (number of copies) and dx/dy (offset between copies).
+
+    Args:
+        path (str): Path of the wave table.
+
+    Returns:
+        dict: The parsed wave table.
+    """
+    if path.endswith(".toml"):
+        import tomllib  # Only needed for TOML tables, available from Python 3.11
+        with open(path, "rb") as table_file:
+            return tomllib.load(table_file)
+    with open(path) as table_file:
+        return json.load(table_file)
+
+
+class WaveScheduler:
+    def __init__(self, table, rng):
+        """
+        Initializes a scheduler that spawns enemies wave by wave from a declarative table.
+
+        Args:
+            table (dict): Wave table as returned by load_wave_table.
+            rng (random.Random): Random generator used for the endless groups.
+        """
+        self.waves = table.get("waves", [])
+        self.endless = table.get("endless")
+        self.rng = rng
+        self.wave = -1
+        self.wave_start_time = 0
+        self.remaining = {}  # Wave index -> members not yet destroyed, including those still to spawn
+        self.next_eid = 1
+        self.__pending = []  # (spawn time, Enemy) of the current wave, sorted by spawn time
+        self.__next_pending = 0
+
+    def start(self, current_time):
+        """
+        Restarts the schedule from the first wave.
+
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+        """
+        self.wave = -1
+        self.remaining = {}
+        self.next_eid = 1
+        self.start_next_wave(current_time)
+
+    def start_next_wave(self, current_time):
+        """
+        Queues the members of the next wave, falling back to a random group once the table runs out.
+
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+        """
+        self.wave += 1
+        self.wave_start_time = current_time
+        if self.wave < len(self.waves):
+            members = self.__build_wave(self.waves[self.wave])
+        elif self.endless:
+            members = self.__build_endless_group()
+        else:
+            members = []
+
+        members.sort(key=lambda member: member[0])
+        self.__pending = [(current_time + delay, enemy) for delay, enemy in members]
+        self.__next_pending = 0
+        self.remaining[self.wave] = len(members)
+
+    def __build_wave(self, wave):
+        """
+        Creates the enemies described by one wave of the table.
+
+        Args:
+            wave (dict): A wave entry with an "enemies" list.
+
+        Returns:
+            list: (delay in milliseconds, Enemy) pairs.
+        """
+        members = []
+        for entry in wave.get("enemies", []):
+            for copy in range(entry.get("count", 1)):
+                eid = entry["eid"] + copy if "eid" in entry else self.next_eid
+                self.next_eid = max(self.next_eid, eid + 1)
+                enemy = Enemy(eid=eid,
+                              x=entry["x"] + entry.get("dx", 0) * copy,
+                              y=entry["y"] + entry.get("dy", 0) * copy,
+                              speed=entry["speed"],
+                              shoot_rate=entry["shoot_rate"],
+                              wave=self.wave)
+                members.append((entry.get("delay_ms", 0), enemy))
+        return members
+
+    def __build_endless_group(self):
+        """
+        Creates a randomized group of enemies from the table's "endless" section.
+
+        Returns:
+            list: (delay in milliseconds, Enemy) pairs.
+        """
+        endless = self.endless
+        rng = self.rng
+        group_size = rng.randint(*endless["size"])
+        members = []
+        for _ in range(group_size):
+            members.append((0, Enemy(eid=self.next_eid,
+                                     x=rng.randint(*endless["x"]),
+                                     y=rng.randint(*endless["y"]),
+                                     speed=rng.uniform(*endless["speed"]),
+                                     shoot_rate=rng.randint(*endless["shoot_rate"]),
+                                     wave=self.wave)))
+            self.next_eid += 1
+        return members
+
+    def get_state(self):
+        """
+        Returns the scheduler's position in the wave table, e.g. for snapshots.
+
+        Returns:
+            tuple: (wave, wave_start_time, next_eid, remaining, pending), where pending lists the
+            (spawn time, Enemy) pairs of the current wave that have not spawned yet.
+        """
+        return (self.wave, self.wave_start_time, self.next_eid, dict(self.remaining),
+                self.__pending[self.__next_pending:])
+
+    def set_state(self, state):
+        """
+        Moves the scheduler to a position returned by get_state; the table and random generator are kept.
+
+        Args:
+            state (tuple): A state as returned by get_state.
+        """
+        self.wave, self.wave_start_time, self.next_eid, remaining, pending = state
+        self.remaining = dict(remaining)
+        self.__pending = list(pending)
+        self.__next_pending = 0
+
+    def spawn_due(self, current_time):
+        """
+        Returns the enemies of the current wave whose spawn time has been reached.
+
+        Args:
+            current_time (float): Current simulation time in milliseconds.
+
+        Returns:
+            list: Newly spawned enemies.
+        """
+        pending = self.__pending
+        start = self.__next_pending
+        end = start
+        while end < len(pending) and pending[end][0] <= current_time:
+            end += 1
+        if end == start:
+            return []
+        self.__next_pending = end
+        return [enemy for _, enemy in pending[start:end]]
+
+    def on_enemy_destroyed(self, enemy, current_time):
+        """
+        Counts a destroyed enemy against its wave and starts the next wave once the current one is cleared.
+
+        Args:
+            enemy (Enemy): The destroyed enemy.
+            current_time (float): Current simulation time in milliseconds.
+        """
+        remaining = self.remaining.get(enemy.wave)
+        if remaining is None:
+            return
+        remaining -= 1
+        self.remaining[enemy.wave] = remaining
+        if remaining == 0 and enemy.wave == self.wave:
+            del self.remaining[enemy.wave]
+            self.start_next_wave(current_time)
+
+
+def scale_wave_table(table, speed_scale=1.0, shoot_rate_scale=1.0):
+    """
+    Returns a copy of a wave table with every enemy's speed and shoot rate scaled, e.g. for balancing runs.
+
+    Args:
+        table (dict): Wave table as returned by load_wave_table.
+        speed_scale (float): Factor applied to enemy speeds.
+        shoot_rate_scale (float): Factor applied to enemy shoot rates (the delay between shots).
+
+    Returns:
+        dict: The scaled wave table.
+    """
+    scaled = {"waves": []}
+    for wave in table.get("waves", []):
+        entries = []
+        for entry in wave.get("enemies", []):
+            entry = dict(entry)
+            entry["speed"] = entry["speed"] * speed_scale
+            entry["shoot_rate"] = entry["shoot_rate"] * shoot_rate_scale
+            entries.append(entry)
+        scaled["waves"].append(dict(wave, enemies=entries))
+    if table.get("endless"):
+        endless = dict(table["endless"])
+        endless["speed"] = [bound * speed_scale for bound in endless["speed"]]
+        endless["shoot_rate"] = [int(bound * shoot_rate_scale) for bound in endless["shoot_rate"]]
+        scaled["endless"] = endless
+    return scaled